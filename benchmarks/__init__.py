@@ -0,0 +1,10 @@
+import os
+
+# Render to memory only, so benchmarks run on machines without a display, and
+# keep pygame's banner out of the JSON report. This must happen before the
+# runner imports pygame.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from .runner import BENCHMARKS, benchmark, compare, measure, run  # noqa: E402
@@ -0,0 +1,132 @@
+from typing import Optional
+
+import pygame
+from pygame.locals import K_DOWN, K_RIGHT
+
+from src.sudoku import Sudoku, SudokuGuiWrapper
+from src.utils import Button, HitIndex, Timer, game_clock, mouse
+
+from .runner import benchmark
+
+
+PUZZLE_FILE = "data/puzzles/medium/0.txt"
+
+
+def _init_display() -> None:
+    """
+    Open the (dummy) display the sprites are drawn for.
+    """
+    if not pygame.display.get_init():
+        pygame.init()
+        pygame.display.set_mode((1200, 900))
+
+
+@benchmark("gui_wrapper.update.idle")
+def gui_wrapper_update_idle():
+    _init_display()
+    wrapper = SudokuGuiWrapper(Sudoku(filename=PUZZLE_FILE))
+    wrapper.update()
+    return wrapper.update
+
+
+@benchmark("gui_wrapper.update.move_selection", ops=9)
+def gui_wrapper_update_move_selection(sudoku: Optional[Sudoku] = None):
+    _init_display()
+    wrapper = SudokuGuiWrapper(sudoku or Sudoku(filename=PUZZLE_FILE))
+    mouse.move_to((200, 200))     # Select the top left cell.
+    wrapper.handle_mouse_event()
+    mouse.move_to(None)
+    wrapper.update()
+    keys = [K_RIGHT] * 8 + [K_DOWN]
+
+    # Moving the selection repaints the old and new row, column and box.
+    def run():
+        for key in keys:
+            wrapper.handle_key_event(key)
+            wrapper.update()
+            wrapper.pop_dirty_rects()
+    return run
+
+
+@benchmark("gui_wrapper.update.move_selection_notes", ops=9)
+def gui_wrapper_update_move_selection_notes():
+    _init_display()
+    sudoku = Sudoku(filename=PUZZLE_FILE)
+    for row in range(9):
+        for col in range(9):
+            sudoku.set_notes((row, col), 0x1FF)
+    return gui_wrapper_update_move_selection(sudoku)
+
+
+@benchmark("button.update.idle")
+def button_update_idle():
+    _init_display()
+    button = Button("MAIN MENU", size=(250, 100), topleft=(0, 0))
+    button.update()
+    return button.update
+
+
+@benchmark("button.update.hover_change", ops=2)
+def button_update_hover_change():
+    _init_display()
+    button = Button("MAIN MENU", size=(250, 100), topleft=(0, 0))
+    hit_index = HitIndex(button)
+
+    def run():
+        hit_index.update((10, 10))
+        button.update()
+        hit_index.update((500, 500))
+        button.update()
+    return run
+
+
+@benchmark("hit_index.update.move", ops=24)
+def hit_index_update_move():
+    _init_display()
+    # A screen crowded with buttons, and the mouse sweeping across it.
+    buttons = [
+        Button(str(i), size=(110, 100), topleft=(150 * (i % 8), 150 * (i // 8)))
+        for i in range(48)
+    ]
+    hit_index = HitIndex(*buttons)
+    path = [(50 * i, 37 * i) for i in range(24)]
+
+    def run():
+        for pos in path:
+            hit_index.update(pos)
+    return run
+
+
+@benchmark("gui_wrapper.handle_mouse_event", ops=81)
+def gui_wrapper_handle_mouse_event():
+    _init_display()
+    wrapper = SudokuGuiWrapper(Sudoku(filename=PUZZLE_FILE))
+    centers = [(170 + 70*col, 170 + 70*row) for row in range(9) for col in range(9)]
+
+    def run():
+        for pos in centers:
+            mouse.move_to(pos)
+            wrapper.handle_mouse_event()
+        mouse.move_to(None)
+    return run
+
+
+@benchmark("timer.update.idle")
+def timer_update_idle():
+    _init_display()
+    game_clock.use_virtual_time()
+    timer = Timer(size=(250, 100), topleft=(0, 0))
+    timer.update()
+    return timer.update
+
+
+@benchmark("timer.update.tick")
+def timer_update_tick():
+    _init_display()
+    game_clock.use_virtual_time()
+    timer = Timer(size=(250, 100), topleft=(0, 0))
+
+    def run():
+        game_clock.advance(1000)
+        timer.update()
+    return run
@@ -0,0 +1,132 @@
+import itertools
+import random
+
+from src.sudoku import (
+    ActionStack, Board, Layout, Sudoku, VariantSudoku, canonical_form, solve_variant
+)
+
+from .runner import benchmark
+
+
+PUZZLE_FILE = "data/puzzles/medium/0.txt"
+HARD_PUZZLE_FILE = "data/puzzles/hard/0.txt"
+CELLS = [(row, col) for row in range(9) for col in range(9)]
+STACK_DEPTH = 1000
+
+
+@benchmark("sudoku.load_file")
+def load_file():
+    return lambda: Sudoku(filename=PUZZLE_FILE)
+
+
+@benchmark("sudoku.get", ops=81)
+def get():
+    sudoku = Sudoku(filename=PUZZLE_FILE)
+
+    def run():
+        for pos in CELLS:
+            sudoku.get(pos)
+    return run
+
+
+@benchmark("sudoku.set", ops=81)
+def set_():
+    sudoku = Sudoku(filename=PUZZLE_FILE)
+    digits = itertools.cycle(range(1, 10))
+
+    def run():
+        for pos in CELLS:
+            sudoku.set(pos, next(digits))
+    return run
+
+
+@benchmark("sudoku.has_valid_digit", ops=81)
+def has_valid_digit():
+    sudoku = Sudoku(filename=PUZZLE_FILE)
+
+    def run():
+        for pos in CELLS:
+            sudoku.has_valid_digit(pos)
+    return run
+
+
+@benchmark("sudoku.is_solved")
+def is_solved():
+    return Sudoku(filename=PUZZLE_FILE).is_solved
+
+
+@benchmark("sudoku.find_hint.hard")
+def find_hint():
+    return Sudoku(filename=HARD_PUZZLE_FILE).find_hint
+
+
+@benchmark("canonical_form.hard")
+def canonical_form_hard():
+    board = Sudoku(filename=HARD_PUZZLE_FILE).to_board()
+    return lambda: canonical_form(board)
+
+
+@benchmark("canonical_form.one_clue")
+def canonical_form_one_clue():
+    # Nearly every arrangement of a near-empty board ties with the others,
+    # which must not make it much slower than a real puzzle.
+    cells = bytearray(81)
+    cells[40] = 5
+    board = Board(bytes(cells))
+    return lambda: canonical_form(board)
+
+
+def _deep_action_stack() -> tuple[Sudoku, ActionStack]:
+    """
+    Get an action stack holding `STACK_DEPTH` actions.
+    """
+    sudoku = Sudoku(filename=PUZZLE_FILE)
+    empty_cells = [pos for pos in CELLS if not sudoku.is_clue(pos)]
+    stack = ActionStack(sudoku)
+    for i in range(STACK_DEPTH):
+        stack.push(empty_cells[i % len(empty_cells)], i % 9 + 1)
+    return sudoku, stack
+
+
+@benchmark(f"action_stack.push@{STACK_DEPTH}")
+def action_stack_push():
+    sudoku, stack = _deep_action_stack()
+    pos = next(pos for pos in CELLS if not sudoku.is_clue(pos))
+
+    # Pushing after an undo discards the undone edit, so the depth stays.
+    def run():
+        stack.undo()
+        stack.push(pos, (sudoku.get(pos) or 0) % 9 + 1)
+    return run
+
+
+@benchmark(f"action_stack.undo_redo@{STACK_DEPTH}", ops=2)
+def action_stack_undo_redo():
+    _, stack = _deep_action_stack()
+
+    def run():
+        stack.undo()
+        stack.redo()
+    return run
+
+
+@benchmark("variant.set.9x9", ops=81)
+def variant_set_9x9():
+    sudoku = Sudoku(filename=PUZZLE_FILE)
+    variant = VariantSudoku(Layout.classic(), bytes(sudoku.to_board().cells))
+    digits = itertools.cycle(range(1, 10))
+
+    def run():
+        for pos in CELLS:
+            variant.set(pos, next(digits))
+    return run
+
+
+@benchmark("variant.solve.16x16")
+def variant_solve_16x16():
+    layout = Layout.classic(16)
+    rng = random.Random(0)
+    cells = bytearray(solve_variant(layout, bytes(layout.cell_count), 1, rng)[0])
+    for index in rng.sample(range(layout.cell_count), layout.cell_count // 2):
+        cells[index] = 0
+    return lambda: solve_variant(layout, cells)
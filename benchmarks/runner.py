@@ -0,0 +1,170 @@
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from typing import Optional
+
+import pygame
+
+
+# A benchmark's setup function returns the function to time. Setup is not timed.
+Setup = Callable[[], Callable[[], object]]
+
+BENCHMARKS: dict[str, tuple[Setup, int]] = {}
+
+
+def benchmark(name: str, ops: int = 1) -> Callable[[Setup], Setup]:
+    """
+    Register a benchmark's setup function under a name. `ops` is the number
+    of operations done by one call of the timed function, so results are
+    reported per operation.
+    """
+    def register(setup: Setup) -> Setup:
+        if name in BENCHMARKS:
+            raise ValueError(f"duplicate benchmark name: {name}")
+        BENCHMARKS[name] = (setup, ops)
+        return setup
+    return register
+
+
+def measure(
+    function: Callable[[], object],
+    ops: int = 1,
+    repeat: int = 5,
+    min_time: float = 0.05,
+) -> dict:
+    """
+    Time a function. The number of calls per repetition is raised until one
+    repetition takes at least `min_time` seconds; the fastest and the median
+    repetition are reported, in nanoseconds per operation.
+    """
+    loops = 1
+    while True:
+        elapsed = _time_loops(function, loops)
+        if elapsed >= min_time:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+
+    timings = [elapsed] + [_time_loops(function, loops) for _ in range(repeat - 1)]
+    per_op = [seconds / (loops * ops) * 1e9 for seconds in timings]
+    median = statistics.median(per_op)
+    return {
+        "loops": loops,
+        "ops": ops,
+        "min_ns": round(min(per_op), 2),
+        "median_ns": round(median, 2),
+        "ops_per_sec": round(1e9 / median, 1),
+    }
+
+
+def _time_loops(function: Callable[[], object], loops: int) -> float:
+    """
+    Get the seconds taken by calling a function `loops` times.
+    """
+    start = time.perf_counter()
+    for _ in range(loops):
+        function()
+    return time.perf_counter() - start
+
+
+def run(pattern: str = "", repeat: int = 5, min_time: float = 0.05) -> dict:
+    """
+    Run the benchmarks whose names contain `pattern`, and report their
+    results along with what they ran on.
+    """
+    from . import bench_gui, bench_model  # noqa: F401 (registers the benchmarks)
+
+    results = {}
+    for name, (setup, ops) in BENCHMARKS.items():
+        if pattern in name:
+            results[name] = measure(setup(), ops, repeat, min_time)
+    return {"meta": _get_meta(), "results": results}
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Compare the fastest times of a report to a baseline report, as these are
+    the least disturbed by other load on the machine. Returns the names of the
+    benchmarks which got slower by more than `threshold` (e.g. 0.2 for 20%).
+    """
+    regressions = []
+    for name, result in report["results"].items():
+        if (old := baseline["results"].get(name)) is None:
+            continue
+        ratio = result["min_ns"] / old["min_ns"]
+        result["baseline_min_ns"] = old["min_ns"]
+        result["ratio"] = round(ratio, 3)
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return regressions
+
+
+def _get_meta() -> dict:
+    """
+    Get the commit, Python and pygame versions and platform benchmarked on.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Command-line entry point. Writes the report as JSON, and exits with 1 if a
+    benchmark regressed against the baseline.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Benchmark the game's hot paths."
+    )
+    parser.add_argument("-k", "--filter", default="", help="only run benchmarks whose names contain this")
+    parser.add_argument("-o", "--output", help="write the report to this file instead of stdout")
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.05, help="minimum seconds per repetition")
+    parser.add_argument("--compare", metavar="BASELINE", help="report to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2,
+        help="fail if a fastest time exceeds the baseline's by more than this fraction",
+    )
+    args = parser.parse_args(argv)
+
+    report = run(args.filter, args.repeat, args.min_time)
+
+    regressions = []
+    if args.compare is not None:
+        with open(args.compare, mode="r") as fp:
+            regressions = compare(report, json.load(fp), args.threshold)
+
+    for name, result in report["results"].items():
+        line = f"{name:<40} {result['min_ns']:>14,.1f} ns/op"
+        if "ratio" in result:
+            line += f"  x{result['ratio']:.2f}"
+            if name in regressions:
+                line += "  REGRESSION"
+        print(line, file=sys.stderr)
+
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, mode="w") as fp:
+            json.dump(report, fp, indent=2)
+
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}.",
+              file=sys.stderr)
+        return 1
+    return 0
@@ -0,0 +1,12 @@
+import os
+import sys
+
+# Runs headless: importing pygame (through the sudoku package) must not print
+# anything to the output stream.
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from src.bulk_solve import main  # noqa: E402
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,60 @@
-from src.sudoku_game import SudokuGame
+import time
+
+STARTED = time.perf_counter()
+
+import argparse  # noqa: E402
+import json  # noqa: E402
+import sys  # noqa: E402
+
+from src.sudoku_game import SudokuGame  # noqa: E402
+from src.utils import font_registry  # noqa: E402
+
+
+def report_startup(imported: float) -> None:
+    """
+    Start the game, display the first frame, print how long each step took
+    since the process started running this script as JSON, and quit.
+    """
+    from src.screen import TitleScreen
+
+    game = SudokuGame()
+    initialized = time.perf_counter()
+    game.screen = TitleScreen(game)
+    game.run_frame()
+    displayed = time.perf_counter()
+
+    json.dump({
+        "imports_ms": round((imported - STARTED) * 1000, 3),
+        "init_ms": round((initialized - imported) * 1000, 3),
+        "first_frame_ms": round((displayed - initialized) * 1000, 3),
+        "total_ms": round((displayed - STARTED) * 1000, 3),
+        "first_frame_at": time.time(),
+    }, sys.stdout)
+    print(flush=True)
+    game.quit()
 
 
 def main() -> None:
-    SudokuGame().start()
+    imported = time.perf_counter()
+    parser = argparse.ArgumentParser(description="Play Sudoku.")
+    parser.add_argument(
+        "--profile", metavar="PATH",
+        help="record frame timings and write them to PATH (CSV if it ends with .csv, else JSON)",
+    )
+    parser.add_argument(
+        "--system-fonts", action="store_true",
+        help="look for fonts not in data/fonts among the installed fonts (slower to start)",
+    )
+    parser.add_argument(
+        "--startup-report", action="store_true",
+        help="print startup timings as JSON once the first frame is displayed, then quit",
+    )
+    args = parser.parse_args()
+
+    font_registry.scan_system_fonts = args.system_fonts
+    if args.startup_report:
+        report_startup(imported)
+    SudokuGame(profile_path=args.profile).start()
 
 
 if __name__ == "__main__":
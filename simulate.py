@@ -0,0 +1,10 @@
+import os
+import sys
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from src.simulation import main  # noqa: E402
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional, TextIO
+
+from .sudoku.board import Board
+from .sudoku.solver import Backend, solve_cells
+
+
+Puzzle = tuple[str, str]    # (puzzle ID, puzzle text)
+
+FIELDS = ["id", "puzzle", "status", "solution_count", "solution", "solve_ms"]
+
+
+def iter_puzzles(path: str) -> Iterator[Puzzle]:
+    """
+    Stream puzzles from a directory of 9-line ".txt" files (searched
+    recursively, like "data/puzzles"), or from a file with one 81-character
+    puzzle per line. Blank lines and lines starting with "#" are skipped.
+    """
+    if os.path.isdir(path):
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if not filename.endswith(".txt"):
+                    continue
+                filename = os.path.join(dirpath, filename)
+                with open(filename, mode="r") as fp:
+                    yield os.path.relpath(filename, path), fp.read()
+        return
+
+    with open(path, mode="r") as fp:
+        for line_number, line in enumerate(fp, start=1):
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield f"{path}:{line_number}", line
+
+
+def solve_chunk(chunk: list[Puzzle], backend: Backend) -> list[dict]:
+    """
+    Validate and solve a chunk of puzzles, looking for a second solution to
+    check uniqueness.
+    """
+    results = []
+    for puzzle_id, text in chunk:
+        try:
+            board = Board.from_string(text)
+        except ValueError:
+            results.append(
+                {"id": puzzle_id, "puzzle": text.strip(), "status": "malformed",
+                 "solution_count": 0, "solution": None, "solve_ms": 0.0}
+            )
+            continue
+
+        start = time.perf_counter()
+        solutions = solve_cells(board.cells, max_solutions=2, backend=backend)
+        solve_ms = (time.perf_counter() - start) * 1000
+
+        status = ["unsolvable", "unique", "multiple"][len(solutions)]
+        solution = None if not solutions else str(Board(solutions[0]))
+        results.append(
+            {"id": puzzle_id, "puzzle": str(board), "status": status,
+             "solution_count": len(solutions), "solution": solution,
+             "solve_ms": round(solve_ms, 3)}
+        )
+    return results
+
+
+def run(
+    puzzles: Iterable[Puzzle],
+    output: TextIO,
+    output_format: str = "jsonl",
+    backend: Backend = "bitmask",
+    workers: Optional[int] = None,
+    chunk_size: int = 256,
+) -> dict[str, int]:
+    """
+    Solve puzzles across a process pool and write one result per puzzle, in
+    input order, as soon as it is ready. At most two chunks per worker are in
+    flight, so memory stays bounded however large the corpus is. Returns how
+    many puzzles ended up with each status.
+    """
+    workers = workers or os.cpu_count() or 1
+    if output_format == "csv":
+        writer = csv.DictWriter(output, fieldnames=FIELDS)
+        writer.writeheader()
+        write = writer.writerow
+    else:
+        def write(result: dict) -> None:
+            output.write(json.dumps(result) + "\n")
+
+    summary = {"unique": 0, "multiple": 0, "unsolvable": 0, "malformed": 0}
+    puzzles = iter(puzzles)
+    pending: deque[Future] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while True:
+            while len(pending) < workers * 2:
+                chunk = list(itertools.islice(puzzles, chunk_size))
+                if not chunk:
+                    break
+                pending.append(executor.submit(solve_chunk, chunk, backend))
+            if not pending:
+                break
+            for result in pending.popleft().result():
+                summary[result["status"]] += 1
+                write(result)
+            output.flush()
+    return summary
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Command-line entry point. Exits with status 1 if any puzzle is malformed,
+    unsolvable or has multiple solutions.
+    """
+    parser = argparse.ArgumentParser(
+        description="Validate, solve and check uniqueness of Sudoku puzzles in bulk."
+    )
+    parser.add_argument("path", help="directory of 9-line .txt puzzles, or a file of 81-character lines")
+    parser.add_argument("-o", "--output", help="output file (default: standard output)")
+    parser.add_argument("-f", "--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("-b", "--backend", choices=["bitmask", "dlx"], default="bitmask")
+    parser.add_argument("-j", "--workers", type=int, help="number of worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="puzzles per work item")
+    args = parser.parse_args(argv)
+
+    output = sys.stdout if args.output is None else open(args.output, mode="w", newline="")
+    try:
+        summary = run(
+            iter_puzzles(args.path), output, args.format, args.backend, args.workers, args.chunk_size
+        )
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(", ".join(f"{count} {status}" for status, count in summary.items()), file=sys.stderr)
+    return 0 if summary["unique"] == sum(summary.values()) else 1
@@ -0,0 +1,27 @@
+import importlib
+import sys
+from collections.abc import Callable, Mapping
+
+
+def lazy_exports(
+    package: str, modules: Mapping[str, str]
+) -> tuple[Callable[[str], object], Callable[[], list[str]]]:
+    """
+    Build the module `__getattr__` and `__dir__` of a package whose public
+    names are imported on first use. `modules` maps each name to the module
+    defining it, relative to `package`. A name is cached in the package once
+    imported, so later lookups do not go through `__getattr__`.
+    """
+    namespace = vars(sys.modules[package])
+
+    def __getattr__(name: str) -> object:
+        if (module := modules.get(name)) is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(namespace) | set(modules))
+
+    return __getattr__, __dir__
@@ -1,5 +1,25 @@
-from .congrats_screen import CongratsScreen
-from .playing_screen import PlayingScreen
-from .screen import Screen
-from .select_screen import SelectScreen
-from .title_screen import TitleScreen
+from typing import TYPE_CHECKING
+
+from ..lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .congrats_screen import CongratsScreen
+    from .playing_screen import PlayingScreen
+    from .screen import Screen
+    from .select_screen import SelectScreen
+    from .title_screen import TitleScreen
+
+
+# The module defining each screen. Screens are imported on first use, so
+# starting the game only loads the title screen.
+_MODULES = {
+    "CongratsScreen": ".congrats_screen",
+    "PlayingScreen": ".playing_screen",
+    "Screen": ".screen",
+    "SelectScreen": ".select_screen",
+    "TitleScreen": ".title_screen",
+}
+
+__all__ = list(_MODULES)
+
+__getattr__, __dir__ = lazy_exports(__name__, _MODULES)
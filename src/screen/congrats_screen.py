@@ -2,7 +2,7 @@
 from pygame.locals import MOUSEBUTTONUP
 
 from .screen import Screen
-from ..utils import Button
+from ..utils import Button, glyph_cache, profiler
 
 
 class CongratsScreen(Screen):
@@ -21,36 +21,32 @@ def __init__(self, game, elapsed_time: str) -> None:
         self.__all_sprites = pygame.sprite.RenderPlain(
             self.__new_game_button, self.__main_menu_button
         )
+        self._hit_index.add(*self.__all_sprites)
 
-        self.__elapsed_time = elapsed_time
+        self.__title = glyph_cache.render("CONGRATULATIONS!", size=80)
+        self.__title_rect = self.__title.get_rect(center=(600, 330))
 
-    def display(self) -> None:
-        self.game.surface.fill("white")
-
-        font = pygame.font.SysFont("Futura", size=80)
-        text = font.render("CONGRATULATIONS!", True, "black")
-        text_rect = text.get_rect(center=(600, 330))
-        self.game.surface.blit(text, text_rect)
+        self.__message = glyph_cache.render(f"You solved the puzzle in {elapsed_time}.", size=50)
+        self.__message_rect = self.__message.get_rect(center=(600, 450))
 
-        font = pygame.font.SysFont("Futura", size=50)
-        text = font.render(
-            f"You solved the puzzle in {self.__elapsed_time}.", True, "black"
-        )
-        text_rect = text.get_rect(center=(600, 450))
-        self.game.surface.blit(text, text_rect)
+    def display(self) -> None:
+        profiler.update_sprites(self.__all_sprites)
 
-        self.__all_sprites.update()
-        self.__all_sprites.draw(self.game.surface)
+        with profiler.phase("draw"):
+            if self._needs_full_redraw:
+                self.game.surface.fill("white")
+                self.game.surface.blit(self.__title, self.__title_rect)
+                self.game.surface.blit(self.__message, self.__message_rect)
+            rects = self.draw_sprites(self.__all_sprites)
 
-        pygame.display.update()
+        self.flip(rects)
 
     def handle_events(self) -> None:
         from .select_screen import SelectScreen
         from .title_screen import TitleScreen
 
-        for event in pygame.event.get():
-            if self.is_quit_event(event):
-                self.game.quit()
+        for event in self.game.get_events():
+            self.handle_game_event(event)
 
             if event.type == MOUSEBUTTONUP:
                 if self.__new_game_button.is_hovered():
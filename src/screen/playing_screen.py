@@ -1,9 +1,11 @@
+from typing import Optional
+
 import pygame
 from pygame.locals import KEYUP, MOUSEBUTTONUP
 
 from .screen import Screen
-from ..sudoku import Difficulty, Sudoku, SudokuGuiWrapper
-from ..utils import Button, Timer
+from ..sudoku import Session, Sudoku, SudokuGuiWrapper
+from ..utils import Button, Timer, profiler
 
 
 CENTERX = 765 + (1200-765)/2
@@ -14,11 +16,13 @@ class PlayingScreen(Screen):
     The screen shown when user is solving a puzzle.
     """
 
-    def __init__(self, game, difficulty: Difficulty) -> None:
+    def __init__(self, game, sudoku: Sudoku, elapsed_ms: int = 0) -> None:
         super().__init__(game)
 
-        self.__sudoku_wrapper = SudokuGuiWrapper(Sudoku(difficulty=difficulty), topleft=(0, 0))
-        self.__timer = Timer(size=(250, 100), top=135, centerx=CENTERX)
+        self.__sudoku_wrapper = SudokuGuiWrapper(sudoku, topleft=(0, 0))
+        self.__timer = Timer(size=(250, 100), elapsed_ms=elapsed_ms, top=75, centerx=CENTERX)
+
+        self.__hint_button = Button("HINT", size=(250, 100), bottom=315, centerx=CENTERX)
 
         self.__undo_button = Button("UNDO", size=(110, 100), bottom=465, right=CENTERX-15)
         self.__redo_button = Button("REDO", size=(110, 100), bottom=465, left=CENTERX+15)
@@ -28,34 +32,74 @@ def __init__(self, game, difficulty: Difficulty) -> None:
         )
         self.__main_menu_button = Button("MAIN MENU", size=(250, 100), bottom=765, centerx=CENTERX)
 
-        self.__all_sprites = pygame.sprite.RenderPlain(
-            self.__sudoku_wrapper,
+        # Widgets other than the board, drawn only when they change.
+        self.__widgets = pygame.sprite.RenderPlain(
             self.__timer,
+            self.__hint_button,
             self.__undo_button,
             self.__redo_button,
             self.__reset_button,
             self.__main_menu_button,
         )
+        self.__all_sprites = pygame.sprite.RenderPlain(self.__sudoku_wrapper, *self.__widgets)
+        self._hit_index.add(
+            self.__hint_button,
+            self.__undo_button,
+            self.__redo_button,
+            self.__reset_button,
+            self.__main_menu_button,
+        )
+
+    @classmethod
+    def from_session(cls, game, session: Session) -> "PlayingScreen":
+        """
+        Continue a saved game, with its timer and undo history.
+        """
+        sudoku = Sudoku(board=session.board)
+        for index, notes in enumerate(session.notes):
+            sudoku.set_notes(divmod(index, 9), notes)
+        screen = cls(game, sudoku, session.elapsed_ms)
+        screen.__sudoku_wrapper.action_stack.load(session.history, session.applied)
+        return screen
 
     def display(self) -> None:
-        self.game.surface.fill("white")
+        profiler.update_sprites(self.__all_sprites)
+
+        with profiler.phase("draw"):
+            dirty_rects = self.__sudoku_wrapper.pop_dirty_rects()
+            if self._needs_full_redraw:
+                self.game.surface.fill("white")
+                self.game.surface.blit(self.__sudoku_wrapper.image, self.__sudoku_wrapper.rect)
+            else:
+                # Only copy the repainted cells of the board to the display surface.
+                offset = (-self.__sudoku_wrapper.rect.left, -self.__sudoku_wrapper.rect.top)
+                for rect in dirty_rects:
+                    self.game.surface.blit(self.__sudoku_wrapper.image, rect, area=rect.move(offset))
+            dirty_rects.extend(self.draw_sprites(self.__widgets))
 
-        self.__all_sprites.update()
-        self.__all_sprites.draw(self.game.surface)
+        self.flip(dirty_rects)
 
-        pygame.display.update()
+    def get_time_to_next_change(self) -> Optional[int]:
+        return self.__timer.get_time_to_next_second()
+
+    def on_quit(self) -> None:
+        self.__save()
 
     def handle_events(self) -> None:
         from .congrats_screen import CongratsScreen
         from .title_screen import TitleScreen
 
-        for event in pygame.event.get():
-            if self.is_quit_event(event):
-                self.game.quit()
+        history_state = self.__get_history_state()
+        for event in self.game.get_events():
+            self.handle_game_event(event)
 
             if event.type == KEYUP:
+                version = self.__sudoku_wrapper.sudoku.version
                 self.__sudoku_wrapper.handle_key_event(event.key)
-                if self.__sudoku_wrapper.sudoku.is_solved():
+                sudoku = self.__sudoku_wrapper.sudoku
+                if sudoku.version != version and sudoku.is_solved():
+                    if self.game.session_file is not None:
+                        self.game.session_file.discard()
                     self.game.screen = CongratsScreen(
                         self.game, self.__timer.get_elapsed_time())
                     return
@@ -64,12 +108,43 @@ def handle_events(self) -> None:
                 if self.__reset_button.is_hovered():
                     self.__sudoku_wrapper.reset()
                     self.__timer.reset()
+                elif self.__hint_button.is_hovered():
+                    with profiler.phase("hint"):
+                        self.__sudoku_wrapper.show_hint()
                 elif self.__undo_button.is_hovered():
                     self.__sudoku_wrapper.undo()
                 elif self.__redo_button.is_hovered():
                     self.__sudoku_wrapper.redo()
                 elif self.__main_menu_button.is_hovered():
+                    self.__save()
                     self.game.screen = TitleScreen(self.game)
                     return
                 else:
                     self.__sudoku_wrapper.handle_mouse_event()
+
+        # Save after every batch of events which changed the puzzle.
+        if self.__get_history_state() != history_state:
+            self.__save()
+
+    def __get_history_state(self) -> tuple[int, int, int]:
+        """
+        Get what changes with every edit, undo or redo.
+        """
+        action_stack = self.__sudoku_wrapper.action_stack
+        return self.__sudoku_wrapper.sudoku.version, len(action_stack), action_stack.applied
+
+    def __save(self) -> None:
+        """
+        Save the game in the background, if the game keeps a session file.
+        """
+        if self.game.session_file is None:
+            return
+        sudoku = self.__sudoku_wrapper.sudoku
+        action_stack = self.__sudoku_wrapper.action_stack
+        self.game.session_file.save(Session(
+            sudoku.to_board(),
+            tuple(sudoku.get_notes((row, col)) for row in range(9) for col in range(9)),
+            self.__timer.get_elapsed_ms(),
+            action_stack.to_bytes(),
+            action_stack.applied,
+        ))
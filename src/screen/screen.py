@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 import pygame
-from pygame.locals import K_ESCAPE, KEYDOWN, QUIT
+from pygame.locals import K_ESCAPE, K_F3, KEYDOWN, KEYUP, QUIT, VIDEOEXPOSE, WINDOWEXPOSED
+
+from ..utils import HitIndex, mouse, profiler
 
 if TYPE_CHECKING:
     from ..sudoku_game import SudokuGame
@@ -16,6 +18,14 @@ class Screen(ABC):
     def __init__(self, game: "SudokuGame") -> None:
         self._game = game
 
+        # Whether the next frame must redraw the whole display surface rather
+        # than only what changed.
+        self._needs_full_redraw = True
+
+        # The sprites reacting to the mouse, such as buttons. Subclasses add
+        # them when creating them.
+        self._hit_index = HitIndex()
+
     @abstractmethod
     def display(self) -> None:
         """
@@ -32,6 +42,74 @@ def handle_events(self) -> None:
         """
         pass
 
+    def on_quit(self) -> None:
+        """
+        Called when the game quits while this screen is shown, e.g. to save
+        progress.
+        """
+        pass
+
+    def update_hover(self) -> None:
+        """
+        Find the sprite under the mouse, from the position sampled this frame.
+        """
+        self._hit_index.update(mouse.get_pos())
+
+    def get_time_to_next_change(self) -> Optional[int]:
+        """
+        Get the milliseconds until the screen changes by itself, such as a
+        clock ticking, or None if it only changes on user input. The game
+        sleeps until then unless an event comes first.
+        """
+        return None
+
+    def draw_sprites(self, sprites: pygame.sprite.AbstractGroup) -> list[pygame.Rect]:
+        """
+        Draw the sprites whose `dirty` attribute is set, or every sprite if the
+        whole display surface is being redrawn, and clear the attribute. Returns
+        the areas drawn.
+        """
+        surface = self.game.surface
+        rects = []
+        for sprite in sprites:
+            if sprite.dirty or self._needs_full_redraw:
+                surface.blit(sprite.image, sprite.rect)
+                sprite.dirty = False
+                rects.append(sprite.rect)
+        return rects
+
+    def flip(self, rects: list[pygame.Rect]) -> None:
+        """
+        Show the areas drawn this frame on the monitor, or the whole display
+        surface if it was redrawn.
+        """
+        with profiler.phase("flip"):
+            if self._needs_full_redraw:
+                self._needs_full_redraw = False
+                pygame.display.update()
+            elif rects:
+                pygame.display.update(rects)
+
+    def invalidate(self) -> None:
+        """
+        Make the next frame redraw the whole display surface, e.g. after
+        something else has drawn over it.
+        """
+        self._needs_full_redraw = True
+
+    def handle_game_event(self, event: pygame.event.Event) -> None:
+        """
+        Handle inputs meant for the whole game rather than this screen: closing
+        the game, toggling the profiler overlay with F3, and repainting the
+        window after it was uncovered.
+        """
+        if self.is_quit_event(event):
+            self.game.quit()
+        if event.type in (VIDEOEXPOSE, WINDOWEXPOSED):
+            self.invalidate()
+        if event.type == KEYUP and event.key == K_F3:
+            self.game.toggle_profiler_overlay()
+
     def is_quit_event(self, event: pygame.event.Event) -> bool:
         """
         Whether user closes the window or presses Escape.
@@ -2,7 +2,8 @@
 from pygame.locals import MOUSEBUTTONUP
 
 from .screen import Screen
-from ..utils import Button
+from ..sudoku import Difficulty, Sudoku
+from ..utils import Button, glyph_cache, profiler
 
 
 class SelectScreen(Screen):
@@ -13,6 +14,9 @@ class SelectScreen(Screen):
     def __init__(self, game) -> None:
         super().__init__(game)
 
+        # Have puzzles ready for the next games from now on.
+        self.game.puzzle_pool.start()
+
         self.__easy_button = Button("EASY", size=(200, 100), right=450, top=550)
         self.__medium_button = Button("MEDIUM", size=(200, 100), centerx=600, top=550)
         self.__hard_button = Button("HARD", size=(200, 100), left=750, top=550)
@@ -20,34 +24,44 @@ def __init__(self, game) -> None:
         self.__all_sprites = pygame.sprite.RenderPlain(
             self.__easy_button, self.__medium_button, self.__hard_button
         )
+        self._hit_index.add(*self.__all_sprites)
 
-    def display(self) -> None:
-        self.game.surface.fill("white")
+        self.__title = glyph_cache.render("DIFFICULTY", size=80)
+        self.__title_rect = self.__title.get_rect(center=(600, 400))
 
-        font = pygame.font.SysFont("Futura", size=80)
-        text = font.render("DIFFICULTY", True, "black")
-        text_rect = text.get_rect(center=(600, 400))
-        self.game.surface.blit(text, text_rect)
+    def display(self) -> None:
+        profiler.update_sprites(self.__all_sprites)
 
-        self.__all_sprites.update()
-        self.__all_sprites.draw(self.game.surface)
+        with profiler.phase("draw"):
+            if self._needs_full_redraw:
+                self.game.surface.fill("white")
+                self.game.surface.blit(self.__title, self.__title_rect)
+            rects = self.draw_sprites(self.__all_sprites)
 
-        pygame.display.update()
+        self.flip(rects)
 
     def handle_events(self) -> None:
-        from .playing_screen import PlayingScreen
-
-        for event in pygame.event.get():
-            if self.is_quit_event(event):
-                self.game.quit()
+        for event in self.game.get_events():
+            self.handle_game_event(event)
 
             if event.type == MOUSEBUTTONUP:
                 if self.__easy_button.is_hovered():
-                    self.game.screen = PlayingScreen(self.game, difficulty="easy")
+                    self.__start_game(difficulty="easy")
                     return
                 if self.__medium_button.is_hovered():
-                    self.game.screen = PlayingScreen(self.game, difficulty="medium")
+                    self.__start_game(difficulty="medium")
                     return
                 if self.__hard_button.is_hovered():
-                    self.game.screen = PlayingScreen(self.game, difficulty="hard")
+                    self.__start_game(difficulty="hard")
                     return
+
+    def __start_game(self, difficulty: Difficulty) -> None:
+        """
+        Switch to a new game with a puzzle from the game's puzzle pool, or with
+        a bundled puzzle if the pool has none of the difficulty ready yet.
+        """
+        from .playing_screen import PlayingScreen
+
+        board = self.game.puzzle_pool.pop(difficulty)
+        sudoku = Sudoku(difficulty=difficulty) if board is None else Sudoku(board=board)
+        self.game.screen = PlayingScreen(self.game, sudoku)
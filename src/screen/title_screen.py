@@ -2,7 +2,7 @@
 from pygame.locals import MOUSEBUTTONUP
 
 from .screen import Screen
-from ..utils import Button
+from ..utils import Button, glyph_cache, profiler
 
 
 class TitleScreen(Screen):
@@ -13,36 +13,52 @@ class TitleScreen(Screen):
     def __init__(self, game) -> None:
         super().__init__(game)
 
-        self.__new_game_button = Button(
-            "NEW GAME", size=(250, 100), right=550, top=550)
-        self.__quit_button = Button("QUIT", size=(
-            250, 100), fg_color="red", left=650, top=550)
+        # Offer to resume a saved game, if there is one.
+        session_file = self.game.session_file
+        if session_file is not None and session_file.exists():
+            self.__resume_button = Button("RESUME", size=(250, 100), right=425, top=550)
+            self.__new_game_button = Button("NEW GAME", size=(250, 100), centerx=600, top=550)
+            self.__quit_button = Button("QUIT", size=(250, 100), fg_color="red", left=775, top=550)
+        else:
+            self.__resume_button = None
+            self.__new_game_button = Button(
+                "NEW GAME", size=(250, 100), right=550, top=550)
+            self.__quit_button = Button("QUIT", size=(
+                250, 100), fg_color="red", left=650, top=550)
 
         self.__all_sprites = pygame.sprite.RenderPlain(
             self.__new_game_button, self.__quit_button
         )
+        if self.__resume_button is not None:
+            self.__all_sprites.add(self.__resume_button)
+        self._hit_index.add(*self.__all_sprites)
 
-    def display(self) -> None:
-        self.game.surface.fill("white")
+        self.__title = glyph_cache.render("SUDOKU", size=100)
+        self.__title_rect = self.__title.get_rect(center=(600, 400))
 
-        font = pygame.font.SysFont("Futura", size=100)
-        text = font.render("SUDOKU", True, "black")
-        text_rect = text.get_rect(center=(600, 400))
-        self.game.surface.blit(text, text_rect)
+    def display(self) -> None:
+        profiler.update_sprites(self.__all_sprites)
 
-        self.__all_sprites.update()
-        self.__all_sprites.draw(self.game.surface)
+        with profiler.phase("draw"):
+            if self._needs_full_redraw:
+                self.game.surface.fill("white")
+                self.game.surface.blit(self.__title, self.__title_rect)
+            rects = self.draw_sprites(self.__all_sprites)
 
-        pygame.display.update()
+        self.flip(rects)
 
     def handle_events(self) -> None:
+        from .playing_screen import PlayingScreen
         from .select_screen import SelectScreen
 
-        for event in pygame.event.get():
-            if self.is_quit_event(event):
-                self.game.quit()
+        for event in self.game.get_events():
+            self.handle_game_event(event)
 
             if event.type == MOUSEBUTTONUP:
+                if self.__resume_button is not None and self.__resume_button.is_hovered():
+                    if (session := self.game.session_file.load()) is not None:
+                        self.game.screen = PlayingScreen.from_session(self.game, session)
+                        return
                 if self.__new_game_button.is_hovered():
                     self.game.screen = SelectScreen(self.game)
                     return
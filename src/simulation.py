@@ -0,0 +1,135 @@
+import argparse
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from typing import Optional
+
+import pygame
+from pygame.locals import KEYDOWN, KEYUP, MOUSEBUTTONDOWN, MOUSEBUTTONUP, MOUSEMOTION
+
+from .sudoku_game import SudokuGame
+from .utils import game_clock, mouse
+
+
+# A recorded input: {"frame": 12, "click": [x, y]}, {"frame": 12, "move": [x, y]}
+# or {"frame": 12, "key": "up"}, with key names as in `pygame.key.name()`.
+ScriptEvent = dict
+
+
+class Simulation:
+    """
+    Runs the game without a window and on virtual time, feeding it recorded
+    inputs and running frames as fast as possible. Given the same script and
+    seed, every run plays out the same way.
+    """
+
+    def __init__(
+        self,
+        script: list[ScriptEvent],
+        fps: int = 60,
+        seed: int = 0,
+        profile_path: Optional[str] = None,
+    ) -> None:
+        """
+        `fps` only sets how far the virtual time moves per frame. If
+        `profile_path` is given, per-phase frame timings are written to it.
+        """
+        self.__events: defaultdict[int, list[ScriptEvent]] = defaultdict(list)
+        for event in script:
+            self.__events[event["frame"]].append(event)
+        self.__frame_ms = 1000 // fps
+        self.__seed = seed
+        self.__profile_path = profile_path
+
+    def run(self, frames: int) -> dict:
+        """
+        Run up to `frames` frames (fewer if the script quits the game), and
+        report the frame rate and the time spent per frame on each screen.
+        """
+        from .screen import TitleScreen
+
+        random.seed(self.__seed)
+        game = SudokuGame(
+            headless=True, fps=0, pool_size=0, profile_path=self.__profile_path, session_path=None
+        )
+        game_clock.use_virtual_time()
+        mouse.move_to((0, 0))
+        game.screen = TitleScreen(game)
+
+        frame_times: defaultdict[str, list[float]] = defaultdict(list)
+        start = time.perf_counter()
+        frame = 0
+        try:
+            for frame in range(frames):
+                for event in self.__events.get(frame, []):
+                    self.__post(event)
+                screen_name = type(game.screen).__name__
+                frame_start = time.perf_counter()
+                game.run_frame()
+                frame_times[screen_name].append(time.perf_counter() - frame_start)
+                game_clock.advance(self.__frame_ms)
+        except SystemExit:
+            pass    # The script quit the game, which saved the profile.
+        else:
+            game.save_profile()
+        finally:
+            mouse.move_to(None)
+        seconds = time.perf_counter() - start
+
+        ran = sum(len(times) for times in frame_times.values())
+        return {
+            "frames": ran,
+            "quit": ran < frames,
+            "seconds": round(seconds, 6),
+            "fps": round(ran / seconds, 1) if seconds else None,
+            "screens": {
+                name: {
+                    "frames": len(times),
+                    "mean_ms": round(sum(times) / len(times) * 1000, 4),
+                    "max_ms": round(max(times) * 1000, 4),
+                }
+                for name, times in frame_times.items()
+            },
+        }
+
+    def __post(self, event: ScriptEvent) -> None:
+        """
+        Post the pygame events of a recorded input.
+        """
+        if "key" in event:
+            key = pygame.key.key_code(event["key"])
+            pygame.event.post(pygame.event.Event(KEYDOWN, key=key, mod=0, unicode=""))
+            pygame.event.post(pygame.event.Event(KEYUP, key=key, mod=0, unicode=""))
+            return
+
+        pos = tuple(event.get("click") or event["move"])
+        mouse.move_to(pos)
+        pygame.event.post(pygame.event.Event(MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0)))
+        if "click" in event:
+            pygame.event.post(pygame.event.Event(MOUSEBUTTONDOWN, pos=pos, button=1))
+            pygame.event.post(pygame.event.Event(MOUSEBUTTONUP, pos=pos, button=1))
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Command-line entry point. Prints the report as JSON.
+    """
+    parser = argparse.ArgumentParser(description="Replay recorded inputs in a headless game.")
+    parser.add_argument("-s", "--script", help="JSON file with a list of recorded inputs")
+    parser.add_argument("-n", "--frames", type=int, default=600, help="number of frames to run")
+    parser.add_argument("--fps", type=int, default=60, help="frame rate of the virtual clock")
+    parser.add_argument("--seed", type=int, default=0, help="seed for picking puzzles")
+    parser.add_argument("--profile", metavar="PATH", help="write per-phase frame timings to PATH")
+    args = parser.parse_args(argv)
+
+    script = []
+    if args.script is not None:
+        with open(args.script, mode="r") as fp:
+            script = json.load(fp)
+
+    report = Simulation(script, args.fps, args.seed, args.profile).run(args.frames)
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
@@ -0,0 +1,101 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Optional
+
+
+MAIN_SCRIPT = "main.py"
+
+
+class StartupReport:
+    """
+    Measures the cold start of the game: the time from launching `main.py` to
+    its first frame, split into imports, initialization and the first frame,
+    and which modules take longest to import (as with `python -X importtime`).
+    Each run starts a fresh interpreter, so nothing is cached in memory.
+    """
+
+    def __init__(self, headless: bool = False, system_fonts: bool = False) -> None:
+        """
+        If `headless`, the game renders to memory only. If `system_fonts`, the
+        game searches the installed fonts, as with `main.py --system-fonts`.
+        """
+        self.__env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+        if headless:
+            self.__env.update(SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+        self.__args = [MAIN_SCRIPT, "--startup-report"]
+        if system_fonts:
+            self.__args.append("--system-fonts")
+
+    def run(self, runs: int = 5, top: int = 15) -> dict:
+        """
+        Start the game `runs` times and report the fastest of each timing, along
+        with the `top` modules by cumulative import time from one more start.
+        """
+        timings = [self.__time_startup() for _ in range(runs)]
+        imports = self.__time_imports()
+        return {
+            "runs": runs,
+            **{key: min(timing[key] for timing in timings) for key in timings[0]},
+            "imports": sorted(imports, key=lambda module: -module["cumulative_ms"])[:top],
+        }
+
+    def __time_startup(self) -> dict:
+        """
+        Start the game once and get its startup timings, including the time
+        before `main.py` runs (starting the interpreter).
+        """
+        launched = time.time()
+        output = subprocess.run(
+            [sys.executable, *self.__args],
+            env=self.__env, stdout=subprocess.PIPE, check=True, text=True,
+        ).stdout
+        timing = json.loads(output.strip().splitlines()[-1])
+        first_frame_at = timing.pop("first_frame_at")
+        timing["launch_to_first_frame_ms"] = round((first_frame_at - launched) * 1000, 3)
+        return timing
+
+    def __time_imports(self) -> list[dict]:
+        """
+        Start the game once with `-X importtime` and get each module's import
+        time, excluding its imports (self) and including them (cumulative).
+        """
+        stderr = subprocess.run(
+            [sys.executable, "-X", "importtime", *self.__args],
+            env=self.__env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True, text=True,
+        ).stderr
+
+        modules = []
+        for line in stderr.splitlines():
+            # "import time: self [us] | cumulative | imported package"
+            if not line.startswith("import time:"):
+                continue
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            if not self_us.strip().isdigit():
+                continue    # The header line.
+            modules.append({
+                "module": name.strip(),
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            })
+        return modules
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Command-line entry point. Prints the report as JSON.
+    """
+    parser = argparse.ArgumentParser(description="Measure how long the game takes to start.")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="number of starts to time")
+    parser.add_argument("--top", type=int, default=15, help="number of slowest imports to list")
+    parser.add_argument("--headless", action="store_true", help="start the game without a window")
+    parser.add_argument("--system-fonts", action="store_true", help="search the installed fonts")
+    args = parser.parse_args(argv)
+
+    report = StartupReport(args.headless, args.system_fonts).run(args.runs, args.top)
+    json.dump(report, sys.stdout, indent=2)
+    print()
+    return 0
@@ -1,2 +1,53 @@
-from .sudoku import Difficulty, Sudoku
-from .sudoku_gui_wrapper import SudokuGuiWrapper
+from typing import TYPE_CHECKING
+
+from ..lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .action_stack import ActionStack
+    from .batch import stack_boards, validate_batch
+    from .board import Board
+    from .canonical import CanonicalIndex, canonical_form, canonical_hash
+    from .generator import generate
+    from .layout import Layout, parse_map
+    from .puzzle_pool import PuzzlePool
+    from .puzzle_store import PuzzleStore
+    from .session import Session, SessionFile
+    from .solver import has_unique_solution, solve
+    from .sudoku import Difficulty, PuzzleSource, Sudoku
+    from .sudoku_gui_wrapper import SudokuGuiWrapper
+    from .transform import Transform, apply_batch
+    from .variant import VariantSudoku, solve_variant
+
+
+# The module defining each public name. Modules are imported on first use, so
+# starting the game does not load the batch and puzzle store tooling.
+_MODULES = {
+    "ActionStack": ".action_stack",
+    "stack_boards": ".batch",
+    "validate_batch": ".batch",
+    "Board": ".board",
+    "CanonicalIndex": ".canonical",
+    "canonical_form": ".canonical",
+    "canonical_hash": ".canonical",
+    "generate": ".generator",
+    "Layout": ".layout",
+    "parse_map": ".layout",
+    "PuzzlePool": ".puzzle_pool",
+    "PuzzleStore": ".puzzle_store",
+    "Session": ".session",
+    "SessionFile": ".session",
+    "has_unique_solution": ".solver",
+    "solve": ".solver",
+    "Difficulty": ".sudoku",
+    "PuzzleSource": ".sudoku",
+    "Sudoku": ".sudoku",
+    "SudokuGuiWrapper": ".sudoku_gui_wrapper",
+    "Transform": ".transform",
+    "apply_batch": ".transform",
+    "VariantSudoku": ".variant",
+    "solve_variant": ".variant",
+}
+
+__all__ = list(_MODULES)
+
+__getattr__, __dir__ = lazy_exports(__name__, _MODULES)
@@ -0,0 +1,254 @@
+import sys
+from array import array
+from typing import Optional
+
+from .sudoku import CellPos, Sudoku
+from ..utils import game_clock
+
+
+# Each change to a cell is packed into 32 bits: the cell index (row*9 + col) in
+# bits 0-6, whether the pencil marks rather than the digit changed in bit 7,
+# the old and new value (a digit with 0 for empty, or a 9-bit mask of marks) in
+# bits 8-16 and 17-25, and in bit 26 whether the change is part of the same
+# edit as the one before it.
+INDEX_MASK = 0x7F
+NOTES_FLAG = 1 << 7
+VALUE_MASK = 0x1FF
+OLD_SHIFT = 8
+NEW_SHIFT = 17
+GROUPED_FLAG = 1 << 26
+
+
+class ActionStack:
+    """
+    Undo/redo history of the edits made to a puzzle. Changes are stored as
+    packed 32-bit deltas in a ring buffer; once it holds `capacity` changes,
+    the oldest edits are forgotten, so memory stays bounded however long the
+    game goes on. Pushing after undoing discards the undone edits in O(1).
+
+    An edit is one change, or a group of changes undone and redone together,
+    such as placing a digit along with removing it from the marks of peers.
+    """
+
+    def __init__(
+        self,
+        sudoku: Sudoku,
+        capacity: int = 10000,
+        coalesce_ms: int = 0,
+        auto_eliminate: bool = True,
+    ) -> None:
+        """
+        If `coalesce_ms` is positive, a digit edit of the cell edited last
+        within that many milliseconds is merged into the same edit, so typing
+        over a digit is undone in one step. If `auto_eliminate`, placing a digit
+        removes it from the pencil marks of the cells sharing a group.
+        """
+        if capacity < 21:
+            raise ValueError("the history must hold at least 21 changes, the most one edit makes")
+        self.__sudoku = sudoku
+        self.__capacity = capacity
+        self.__coalesce_ms = coalesce_ms
+        self.__auto_eliminate = auto_eliminate
+        self.__entries = array("I", bytes(4 * capacity))
+        self.__start = 0        # Ring buffer index of the oldest change.
+        self.__size = 0         # Number of changes in the history.
+        self.__current = 0      # Number of changes applied (not undone).
+        self.__last_push: Optional[int] = None
+
+    def push(self, pos: CellPos, digit: Optional[int]) -> None:
+        """
+        Set the digit inside a cell and record the edit. Edits which change
+        nothing are not recorded.
+        """
+        old_digit = self.__sudoku.get(pos) or 0
+        new_digit = digit or 0
+        if self.__sudoku.is_clue(pos) or old_digit == new_digit:
+            return
+        self.__sudoku.set(pos, digit)
+
+        eliminated: list[int] = []
+        if new_digit and self.__auto_eliminate:
+            eliminated = self.__sudoku.eliminate_note(pos, new_digit)
+
+        row, col = pos
+        index = row*9 + col
+        now = game_clock.get_ticks()
+        if self.__can_coalesce(index, now):
+            slot = (self.__start + self.__current - 1) % self.__capacity
+            old_digit = self.__entries[slot] >> OLD_SHIFT & VALUE_MASK
+            if old_digit == new_digit and not eliminated:
+                # The cell is back to its digit before the edit, so the change
+                # is dropped.
+                self.__size = self.__current = self.__current - 1
+                self.__last_push = None
+            else:
+                self.__entries[slot] = index | old_digit << OLD_SHIFT | new_digit << NEW_SHIFT
+                self.__last_push = now
+        else:
+            self.__truncate()
+            self.__append(index | old_digit << OLD_SHIFT | new_digit << NEW_SHIFT)
+            self.__last_push = now
+
+        if eliminated:
+            bit = 1 << (new_digit - 1)
+            for peer in eliminated:
+                notes = self.__sudoku.get_notes(divmod(peer, 9))
+                self.__append(
+                    peer | NOTES_FLAG | (notes | bit) << OLD_SHIFT | notes << NEW_SHIFT
+                    | GROUPED_FLAG
+                )
+
+    def push_notes(self, pos: CellPos, notes: int) -> None:
+        """
+        Set the pencil marks of a cell and record the edit. Edits which change
+        nothing are not recorded.
+        """
+        old_notes = self.__sudoku.get_notes(pos)
+        if self.__sudoku.is_clue(pos) or old_notes == notes:
+            return
+        self.__sudoku.set_notes(pos, notes)
+
+        row, col = pos
+        self.__truncate()
+        self.__append(row*9 + col | NOTES_FLAG | old_notes << OLD_SHIFT | notes << NEW_SHIFT)
+        self.__last_push = None
+
+    def undo(self) -> None:
+        """
+        Undo the last applied edit, if any.
+        """
+        self.__last_push = None
+        while self.__current > 0:
+            self.__current -= 1
+            entry = self.__entries[(self.__start + self.__current) % self.__capacity]
+            self.__apply(entry, entry >> OLD_SHIFT & VALUE_MASK)
+            if not entry & GROUPED_FLAG:
+                return
+
+    def redo(self) -> None:
+        """
+        Redo the last undone edit, if any.
+        """
+        self.__last_push = None
+        if self.__current == self.__size:
+            return
+        while True:
+            entry = self.__entries[(self.__start + self.__current) % self.__capacity]
+            self.__apply(entry, entry >> NEW_SHIFT & VALUE_MASK)
+            self.__current += 1
+            if self.__current == self.__size:
+                return
+            if not self.__entries[(self.__start + self.__current) % self.__capacity] & GROUPED_FLAG:
+                return
+
+    def reset(self) -> None:
+        """
+        Forget every edit.
+        """
+        self.__start = self.__size = self.__current = 0
+        self.__last_push = None
+
+    def to_bytes(self) -> bytes:
+        """
+        Get the history as packed little-endian 32-bit changes, oldest first.
+        """
+        end = self.__start + self.__size
+        if end <= self.__capacity:
+            entries = self.__entries[self.__start:end]
+        else:
+            entries = self.__entries[self.__start:] + self.__entries[:end - self.__capacity]
+        if sys.byteorder == "big":
+            entries.byteswap()
+        return entries.tobytes()
+
+    def load(self, data: bytes, applied: int) -> None:
+        """
+        Replace the history with one from `to_bytes()`, whose first `applied`
+        changes are already applied to the puzzle.
+        """
+        entries = array("I")
+        entries.frombytes(data)
+        if sys.byteorder == "big":
+            entries.byteswap()
+
+        # Keep the newest edits which fit.
+        skipped = max(0, len(entries) - self.__capacity)
+        while skipped < len(entries) and entries[skipped] & GROUPED_FLAG:
+            skipped += 1
+        kept = len(entries) - skipped
+        self.__entries[:kept] = entries[skipped:]
+        self.__start = 0
+        self.__size = kept
+        self.__current = max(0, min(applied - skipped, kept))
+        self.__last_push = None
+
+    @property
+    def applied(self) -> int:
+        """
+        The number of changes in the history which are not undone.
+        """
+        return self.__current
+
+    def can_undo(self) -> bool:
+        """
+        Whether there is an edit to undo.
+        """
+        return self.__current > 0
+
+    def can_redo(self) -> bool:
+        """
+        Whether there is an undone edit to redo.
+        """
+        return self.__current < self.__size
+
+    def __len__(self) -> int:
+        return self.__size
+
+    def __truncate(self) -> None:
+        """
+        Discard the undone changes.
+        """
+        self.__size = self.__current
+
+    def __append(self, entry: int) -> None:
+        """
+        Record an applied change, forgetting the oldest edit if full.
+        """
+        if self.__size == self.__capacity:
+            self.__drop_oldest()
+        self.__entries[(self.__start + self.__size) % self.__capacity] = entry
+        self.__size = self.__current = self.__size + 1
+
+    def __drop_oldest(self) -> None:
+        """
+        Forget the oldest edit, with all of its changes.
+        """
+        while True:
+            self.__start = (self.__start + 1) % self.__capacity
+            self.__size -= 1
+            self.__current -= 1
+            if self.__size == 0 or not self.__entries[self.__start] & GROUPED_FLAG:
+                return
+
+    def __can_coalesce(self, index: int, now: int) -> bool:
+        """
+        Whether a digit edit of a cell may be merged into the last edit.
+        """
+        if self.__coalesce_ms <= 0 or self.__last_push is None:
+            return False
+        if self.__current == 0 or self.__current != self.__size:
+            return False
+        if now - self.__last_push > self.__coalesce_ms:
+            return False
+        slot = (self.__start + self.__current - 1) % self.__capacity
+        return self.__entries[slot] & (INDEX_MASK | NOTES_FLAG | GROUPED_FLAG) == index
+
+    def __apply(self, entry: int, value: int) -> None:
+        """
+        Set the digit or pencil marks of the cell of a packed change.
+        """
+        pos = divmod(entry & INDEX_MASK, 9)
+        if entry & NOTES_FLAG:
+            self.__sudoku.set_notes(pos, value)
+        else:
+            self.__sudoku.set(pos, value or None)
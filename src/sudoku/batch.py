@@ -0,0 +1,67 @@
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Union
+
+from .board import Board, require_numpy
+from .sudoku import Sudoku
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def stack_boards(boards: Iterable[Union[Sudoku, Board]]) -> "np.ndarray":
+    """
+    Stack boards into an (N, 9, 9) uint8 array, with a single copy of the
+    digits.
+    """
+    np = require_numpy("stack_boards()")
+    data = b"".join(
+        (board.to_board() if isinstance(board, Sudoku) else board).cells for board in boards
+    )
+    return np.frombuffer(data, dtype=np.uint8).reshape(-1, 9, 9)
+
+
+def validate_batch(
+    boards: "np.ndarray", chunk_size: int = 16384
+) -> tuple["np.ndarray", "np.ndarray"]:
+    """
+    Validate an (N, 9, 9) array of boards (0 for empty cells) at once. Returns
+    an (N,) bool array telling which boards are solved, and an (N, 9, 9) bool
+    array marking the filled cells whose digit also appears elsewhere in their
+    row, column or 3x3 box. Boards are processed `chunk_size` at a time to
+    bound the size of the intermediate one-hot arrays.
+    """
+    np = require_numpy("validate_batch()")
+    boards = np.asarray(boards, dtype=np.uint8)
+    solved = np.empty(len(boards), dtype=bool)
+    conflicts = np.empty(boards.shape, dtype=bool)
+    for start in range(0, len(boards), chunk_size):
+        chunk = slice(start, start + chunk_size)
+        solved[chunk], conflicts[chunk] = _validate_chunk(boards[chunk])
+    return solved, conflicts
+
+
+def _validate_chunk(boards: "np.ndarray") -> tuple["np.ndarray", "np.ndarray"]:
+    """
+    Count every digit in every row, column and box with one-hot sums, then look
+    up the counts of each cell's own digit.
+    """
+    np = require_numpy("validate_batch()")
+    count = len(boards)
+    one_hot = boards[..., None] == np.arange(10, dtype=np.uint8)     # (N, 9, 9, 10)
+    row_counts = one_hot.sum(axis=2, dtype=np.uint8)                  # (N, row, digit)
+    col_counts = one_hot.sum(axis=1, dtype=np.uint8)                  # (N, col, digit)
+    box_counts = one_hot.reshape(count, 3, 3, 3, 3, 10).sum(axis=(2, 4), dtype=np.uint8)
+    box_counts = box_counts.reshape(count, 9, 10)                     # (N, box, digit)
+
+    index = np.arange(count)[:, None, None]
+    rows, cols = np.indices((9, 9))
+    boxes = rows // 3 * 3 + cols // 3
+    repeated = (
+        (row_counts[index, rows, boards] > 1)
+        | (col_counts[index, cols, boards] > 1)
+        | (box_counts[index, boxes, boards] > 1)
+    )
+    filled = boards > 0
+    conflicts = filled & repeated
+    solved = filled.all(axis=(1, 2)) & ~conflicts.any(axis=(1, 2))
+    return solved, conflicts
@@ -0,0 +1,127 @@
+import importlib
+from typing import TYPE_CHECKING, Optional, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+CellPos = tuple[int, int]
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+def require_numpy(feature: str):
+    """
+    Import NumPy on first use, since only array conversion and the batch tools
+    need it, or raise an `ImportError` naming the feature if it is missing.
+    """
+    try:
+        return importlib.import_module("numpy")
+    except ImportError:
+        raise ImportError(f"{feature} requires NumPy") from None
+
+
+class Board:
+    """
+    Compact 9x9 Sudoku board, stored as 81 bytes of digits (0 for an empty
+    cell) in row-major order plus a bitmask of clue cells. It is meant for
+    holding and processing many boards at once; copies are plain buffer copies.
+    """
+
+    __slots__ = ("__cells", "__clues")
+
+    def __init__(self, cells: Buffer = bytes(81), clues: Optional[int] = None) -> None:
+        """
+        Create a board from 81 digits. If `clues` is not given, every filled
+        cell is a clue.
+        """
+        if len(cells) != 81:
+            raise ValueError(f"a board has 81 cells, got {len(cells)}")
+        self.__cells = bytearray(cells)
+        if clues is None:
+            clues = sum(1 << index for index, digit in enumerate(self.__cells) if digit)
+        self.__clues = clues
+
+    @classmethod
+    def from_array(cls, array: "np.ndarray", clues: Optional[int] = None) -> "Board":
+        """
+        Create a board from a (9, 9) or (81,) array of digits. The digits are
+        copied, since a board owns its buffer.
+        """
+        np = require_numpy("Board.from_array()")
+        return cls(np.ascontiguousarray(array, dtype=np.uint8).tobytes(), clues)
+
+    @classmethod
+    def from_string(cls, text: str) -> "Board":
+        """
+        Parse a board from 81 characters, either on one line or on 9 lines.
+        Empty cells are written as "." or "0". Every given digit is a clue.
+        """
+        chars = "".join(text.split())
+        if len(chars) != 81:
+            raise ValueError(f"a board has 81 cells, got {len(chars)}")
+        return cls(bytes(0 if char == "." else int(char) for char in chars))
+
+    def get(self, pos: CellPos) -> Optional[int]:
+        """
+        Get the digit inside a cell.
+        """
+        row, col = pos
+        return self.__cells[row*9 + col] or None
+
+    def set(self, pos: CellPos, digit: Optional[int]) -> None:
+        """
+        Set the digit inside a cell. This has no effect if the cell is a clue.
+        """
+        row, col = pos
+        index = row*9 + col
+        if not self.__clues >> index & 1:
+            self.__cells[index] = digit or 0
+
+    def is_clue(self, pos: CellPos) -> bool:
+        """
+        Whether the cell is a clue.
+        """
+        row, col = pos
+        return bool(self.__clues >> (row*9 + col) & 1)
+
+    def copy(self) -> "Board":
+        """
+        Get an independent copy of the board.
+        """
+        return Board(self.__cells, self.__clues)
+
+    def to_bytes(self) -> bytes:
+        """
+        Get the 81 digits as an immutable snapshot.
+        """
+        return bytes(self.__cells)
+
+    def to_array(self) -> "np.ndarray":
+        """
+        Get a read-only (9, 9) uint8 array view of the digits, without copying.
+        It reflects later changes to the board.
+        """
+        np = require_numpy("Board.to_array()")
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(9, 9)
+
+    @property
+    def cells(self) -> memoryview:
+        """
+        Read-only view of the 81 digits.
+        """
+        return memoryview(self.__cells).toreadonly()
+
+    @property
+    def clues(self) -> int:
+        """
+        Bitmask of clue cells; bit `row*9 + col` is set if the cell is a clue.
+        """
+        return self.__clues
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Board):
+            return NotImplemented
+        return self.__cells == other.__cells and self.__clues == other.__clues
+
+    def __str__(self) -> str:
+        return "".join(str(digit) if digit else "." for digit in self.__cells)
@@ -0,0 +1,225 @@
+import hashlib
+import itertools
+import operator
+import os
+import struct
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Union
+
+from .board import Board
+from .sudoku import Sudoku
+
+
+PERMUTATIONS_3 = list(itertools.permutations(range(3)))
+
+# The 1296 orders of columns reachable by permuting stacks and the columns
+# within each stack.
+COLUMN_ORDERS = [
+    tuple(stacks[i]*3 + orders[i][j] for i in range(3) for j in range(3))
+    for stacks in PERMUTATIONS_3
+    for orders in itertools.product(PERMUTATIONS_3, repeat=3)
+]
+
+# How many tied arrangements to keep before merging those bound to continue the
+# same way. Merging costs more than it saves on the few ties of most boards.
+MERGE_THRESHOLD = 4096
+
+# A partial arrangement: the grid (original or transposed), source rows chosen
+# so far, column order, and the digit labels given so far.
+_State = tuple[tuple[bytes, ...], tuple[int, ...], tuple[int, ...], bytes]
+
+
+def canonical_form(board: Union[Sudoku, Board]) -> str:
+    """
+    Get the canonical form of a board under the Sudoku symmetry group
+    (transposition, band and stack permutations, row and column permutations
+    within them, and digit relabeling). Two boards are equivalent if and only
+    if their canonical forms are equal.
+
+    The canonical form is the lexicographically smallest of all equivalent
+    boards, with empty cells as "0" and digits relabeled 1, 2, ... in order of
+    first appearance. It is built row by row, keeping only the arrangements
+    whose rows so far are the smallest. When many arrangements tie, as on
+    sparse or symmetric boards, those bound to continue the same way are
+    merged, so such boards take about as long as others.
+    """
+    board = board.to_board() if isinstance(board, Sudoku) else board
+    cells = bytes(board.cells)
+    grid = tuple(cells[row*9:row*9 + 9] for row in range(9))
+    transposed = tuple(cells[col::9] for col in range(9))
+
+    # Column orders which only swap equal columns give the same arrangement.
+    arrangements: dict[tuple, _State] = {}
+    for orientation in (grid, transposed):
+        columns = tuple(bytes(line[col] for line in orientation) for col in range(9))
+        for order in COLUMN_ORDERS:
+            key = operator.itemgetter(*order)(columns)
+            arrangements.setdefault(key, (orientation, (), order, bytes(10)))
+    states = list(arrangements.values())
+    canonical = []
+    for out_row in range(9):
+        best: Optional[bytes] = None
+        survivors: list[_State] = []
+        for orientation, rows, order, labels in states:
+            for row in _next_rows(rows, out_row):
+                line, new_labels = _relabel(orientation[row], order, labels)
+                if best is None or line < best:
+                    best, survivors = line, []
+                if line == best:
+                    survivors.append((orientation, rows + (row,), order, new_labels))
+        canonical.append(best)
+        # The first row only multiplies the arrangements by up to 9; ties
+        # compound from then on.
+        if out_row > 0 and len(survivors) > MERGE_THRESHOLD:
+            survivors = list({_future_of(state): state for state in survivors}.values())
+        states = survivors
+    return "".join(str(digit) for line in canonical for digit in line)
+
+
+def canonical_hash(board: Union[Sudoku, Board]) -> bytes:
+    """
+    Get a 16-byte hash of the canonical form of a board.
+    """
+    return hashlib.blake2b(canonical_form(board).encode(), digest_size=16).digest()
+
+
+def _next_rows(rows: tuple[int, ...], out_row: int) -> Iterator[int]:
+    """
+    Get the source rows which may come next: any row of an unused band at the
+    start of a band, otherwise the unused rows of the current band.
+    """
+    if out_row % 3 == 0:
+        used_bands = {row // 3 for row in rows}
+        return (row for row in range(9) if row // 3 not in used_bands)
+    band = rows[-1] // 3
+    return (row for row in range(band*3, band*3 + 3) if row not in rows)
+
+
+def _relabel(line: bytes, order: tuple[int, ...], labels: bytes) -> tuple[bytes, bytes]:
+    """
+    Reorder a row by a column order and relabel its digits, giving new labels
+    to digits not seen before. Returns the row and the updated labels.
+    """
+    labels = bytearray(labels)
+    next_label = max(labels) + 1
+    result = bytearray(9)
+    for i, col in enumerate(order):
+        if not (digit := line[col]):
+            continue
+        if not labels[digit]:
+            labels[digit] = next_label
+            next_label += 1
+        result[i] = labels[digit]
+    return bytes(result), bytes(labels)
+
+
+def _future_of(state: _State) -> tuple:
+    """
+    Get what decides how an arrangement continues: the labels, the rows left
+    in the band being filled, and the rows of each band not started (in no
+    particular order, since any of them may come next), with their columns in
+    the arrangement's order.
+    """
+    orientation, rows, order, labels = state
+    reorder = operator.itemgetter(*order)
+    band_lines = [
+        tuple(sorted(
+            bytes(reorder(orientation[row])) for row in range(band*3, band*3 + 3) if row not in rows
+        ))
+        for band in range(3)
+    ]
+    used_bands = {row // 3 for row in rows}
+    current = rows[-1] // 3 if len(rows) % 3 else None
+    return (
+        labels,
+        band_lines[current] if current is not None else (),
+        tuple(sorted(band_lines[band] for band in range(3) if band not in used_bands)),
+    )
+
+
+# Index file record: 16-byte canonical hash and 8-byte puzzle ID.
+RECORD = struct.Struct("<16sQ")
+
+
+class CanonicalIndex:
+    """
+    Persistent index from canonical hashes to puzzle IDs, for finding puzzles
+    which are equivalent under symmetry. The file is an append-only list of
+    fixed-size records, loaded into a dict on opening; insertion appends one
+    record, so building an index scales linearly with the number of puzzles.
+    """
+
+    def __init__(self, filename: str) -> None:
+        self.__ids: dict[bytes, int] = {}
+        if os.path.exists(filename):
+            with open(filename, mode="rb") as fp:
+                data = fp.read()
+            usable = len(data) - len(data) % RECORD.size    # Ignore a torn last record.
+            for puzzle_hash, puzzle_id in RECORD.iter_unpack(data[:usable]):
+                self.__ids.setdefault(puzzle_hash, puzzle_id)
+        self.__fp = open(filename, mode="ab")
+
+    def add(self, puzzle_hash: bytes, puzzle_id: int) -> Optional[int]:
+        """
+        Insert a puzzle by its canonical hash. If an equivalent puzzle is
+        already indexed, nothing is inserted and its ID is returned instead.
+        """
+        if (existing := self.__ids.get(puzzle_hash)) is not None:
+            return existing
+        self.__ids[puzzle_hash] = puzzle_id
+        self.__fp.write(RECORD.pack(puzzle_hash, puzzle_id))
+        return None
+
+    def get(self, puzzle_hash: bytes) -> Optional[int]:
+        """
+        Get the ID of the indexed puzzle with a canonical hash, if any.
+        """
+        return self.__ids.get(puzzle_hash)
+
+    def close(self) -> None:
+        """
+        Write pending records and close the file.
+        """
+        self.__fp.close()
+
+    def __contains__(self, puzzle_hash: bytes) -> bool:
+        return puzzle_hash in self.__ids
+
+    def __len__(self) -> int:
+        return len(self.__ids)
+
+    def __enter__(self) -> "CanonicalIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _hash_puzzle(puzzle: tuple[int, str]) -> tuple[int, bytes]:
+    """
+    Hash one (puzzle ID, puzzle text) pair, in a worker process.
+    """
+    puzzle_id, text = puzzle
+    return puzzle_id, canonical_hash(Board.from_string(text))
+
+
+def build_index(
+    index: CanonicalIndex,
+    puzzles: Iterable[tuple[int, str]],
+    workers: Optional[int] = None,
+    chunk_size: int = 64,
+) -> Iterator[tuple[int, int]]:
+    """
+    Add (puzzle ID, puzzle text) pairs to an index, hashing them across a
+    process pool. Yields (puzzle ID, ID of the equivalent indexed puzzle) for
+    every duplicate found.
+    """
+    puzzles = iter(puzzles)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Hand out a bounded batch at a time, so memory stays flat however many
+        # puzzles there are.
+        while batch := list(itertools.islice(puzzles, chunk_size * 64)):
+            for puzzle_id, puzzle_hash in executor.map(_hash_puzzle, batch, chunksize=chunk_size):
+                if (existing := index.add(puzzle_hash, puzzle_id)) is not None:
+                    yield puzzle_id, existing
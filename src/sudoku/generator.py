@@ -0,0 +1,73 @@
+import random
+from typing import Optional
+
+from .board import Board
+from .solver import solve_cells
+from .sudoku import Difficulty
+from .techniques import Grade, grade
+
+
+# The grades accepted for each difficulty, and how many clues to stop removing
+# at (fewer clues usually means a harder puzzle).
+DIFFICULTY_GRADES: dict[Difficulty, tuple[Grade, ...]] = {
+    "easy": (Grade.HIDDEN_SINGLES,),
+    "medium": (Grade.NAKED_SINGLES, Grade.INTERSECTIONS),
+    "hard": (Grade.SUBSETS, Grade.FISH, Grade.GUESSING),
+}
+MIN_CLUES: dict[Difficulty, int] = {"easy": 32, "medium": 26, "hard": 17}
+
+
+def generate(
+    difficulty: Difficulty = "easy",
+    rng: Optional[random.Random] = None,
+    max_attempts: int = 20,
+) -> Board:
+    """
+    Generate a puzzle with a unique solution and of given difficulty. Each
+    attempt makes a random solution grid and removes clues (in pairs which are
+    symmetric about the center) as long as the solution stays unique. If no
+    attempt reaches the difficulty, the closest puzzle found is returned.
+    """
+    rng = rng or random.Random()
+    wanted = DIFFICULTY_GRADES[difficulty]
+    closest: Optional[tuple[int, list[int]]] = None
+    for _ in range(max_attempts):
+        puzzle = _remove_clues(_random_solution(rng), rng, MIN_CLUES[difficulty])
+        puzzle_grade = grade(puzzle)
+        if puzzle_grade in wanted:
+            return Board(bytes(puzzle))
+        distance = min(abs(puzzle_grade - wanted_grade) for wanted_grade in wanted)
+        if closest is None or distance < closest[0]:
+            closest = (distance, puzzle)
+    return Board(bytes(closest[1]))
+
+
+def _random_solution(rng: random.Random) -> list[int]:
+    """
+    Make a random, completely filled grid.
+    """
+    return list(solve_cells([0] * 81, max_solutions=1, rng=rng)[0])
+
+
+def _remove_clues(cells: list[int], rng: random.Random, min_clues: int) -> list[int]:
+    """
+    Empty cells in random order, keeping the solution unique, until no more
+    cells can be emptied or only `min_clues` clues are left.
+    """
+    cells = cells[:]
+    clues = 81
+    order = list(range(41))
+    rng.shuffle(order)
+    for index in order:
+        pair = {index, 80 - index}
+        if clues - len(pair) < min_clues:
+            continue
+        removed = [cells[i] for i in pair]
+        for i in pair:
+            cells[i] = 0
+        if len(solve_cells(cells, max_solutions=2)) == 1:
+            clues -= len(pair)
+        else:
+            for i, digit in zip(pair, removed):
+                cells[i] = digit
+    return cells
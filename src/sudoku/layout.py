@@ -0,0 +1,162 @@
+import math
+from collections.abc import Iterable, Sequence
+from typing import Optional
+
+
+MIN_SIZE = 4
+MAX_SIZE = 25   # The largest digit must fit in a byte, and a mask of digits in 32 bits.
+
+Cage = tuple[tuple[int, ...], int]    # (cells of the cage, sum of their digits)
+
+
+class Layout:
+    """
+    The constraint tables of a Sudoku variant on an NxN grid, built once and
+    shared by every puzzle of the variant. Cells are numbered 0 to N*N - 1 in
+    row-major order, i.e. cell `row*N + col`. Every row, column and region must
+    hold the digits 1 to N exactly once; regions are the boxes of the classic
+    game or the irregular shapes of Jigsaw Sudoku. Killer Sudoku adds cages: no
+    digit repeats within a cage, and its digits add up to the cage's sum.
+
+    The tables are plain tuples, meant to be read directly in hot loops:
+        `units`:        rows, then columns, then regions, each listing its cells
+        `cell_units`:   the row, column and region unit of each cell
+        `peers`:        the other cells sharing a unit or a cage with each cell
+        `cages`:        (cells, sum) of each cage
+        `cage_of`:      the cage of each cell, or -1 if it is in none
+    """
+
+    __slots__ = (
+        "size", "cell_count", "all_digits", "box_shape",
+        "row_of", "col_of", "region_of", "units", "cell_units", "peers", "cages", "cage_of",
+    )
+
+    def __init__(
+        self,
+        regions: Sequence[Sequence[int]],
+        cages: Iterable[Cage] = (),
+        box_shape: Optional[tuple[int, int]] = None,
+    ) -> None:
+        """
+        Build the tables of a grid split into `regions` (N regions of N cells
+        each), with optional `cages`. `box_shape` is the (rows, columns) of
+        each region if they are rectangular boxes, as in the classic game.
+        """
+        size = len(regions)
+        if not MIN_SIZE <= size <= MAX_SIZE:
+            raise ValueError(f"a grid has {MIN_SIZE} to {MAX_SIZE} regions, got {size}")
+        cell_count = size * size
+        region_of = [-1] * cell_count
+        for region, cells in enumerate(regions):
+            if len(cells) != size:
+                raise ValueError(f"region {region} has {len(cells)} cells, expected {size}")
+            for index in cells:
+                if not 0 <= index < cell_count or region_of[index] >= 0:
+                    raise ValueError(f"regions must split the grid, got cell {index} twice or more")
+                region_of[index] = region
+
+        self.size = size
+        self.cell_count = cell_count
+        self.all_digits = (1 << size) - 1
+        self.box_shape = box_shape
+        self.row_of = tuple(index // size for index in range(cell_count))
+        self.col_of = tuple(index % size for index in range(cell_count))
+        self.region_of = tuple(region_of)
+        self.units = (
+            tuple(tuple(row*size + col for col in range(size)) for row in range(size))
+            + tuple(tuple(row*size + col for row in range(size)) for col in range(size))
+            + tuple(tuple(sorted(cells)) for cells in regions)
+        )
+        self.cell_units = tuple(
+            (self.row_of[index], size + self.col_of[index], 2*size + region_of[index])
+            for index in range(cell_count)
+        )
+
+        cage_of = [-1] * cell_count
+        self.cages: tuple[Cage, ...] = tuple(
+            (tuple(sorted(cells)), total) for cells, total in cages
+        )
+        for cage, (cells, total) in enumerate(self.cages):
+            if not 1 <= len(cells) <= size:
+                raise ValueError(f"cage {cage} has {len(cells)} cells, expected 1 to {size}")
+            lowest = sum(range(1, len(cells) + 1))
+            highest = sum(range(size - len(cells) + 1, size + 1))
+            if not lowest <= total <= highest:
+                raise ValueError(f"cage {cage} of {len(cells)} cells cannot add up to {total}")
+            for index in cells:
+                if not 0 <= index < cell_count or cage_of[index] >= 0:
+                    raise ValueError(f"cages must not overlap, got cell {index} twice or more")
+                cage_of[index] = cage
+        self.cage_of = tuple(cage_of)
+
+        self.peers = tuple(
+            tuple(sorted(
+                set().union(
+                    *(self.units[unit] for unit in self.cell_units[index]),
+                    self.cages[cage_of[index]][0] if cage_of[index] >= 0 else (),
+                ) - {index}
+            ))
+            for index in range(cell_count)
+        )
+
+    @classmethod
+    def classic(cls, size: int = 9) -> "Layout":
+        """
+        The grid with rectangular boxes: square boxes if `size` is a square
+        (4, 9, 16 or 25), otherwise boxes as close to square as possible with
+        fewer rows than columns (2x3 for 6x6, 3x4 for 12x12, and so on).
+        """
+        box_rows = max(rows for rows in range(1, math.isqrt(size) + 1) if size % rows == 0)
+        box_cols = size // box_rows
+        regions = [
+            [
+                (box // box_rows * box_rows + i // box_cols) * size
+                + box % box_rows * box_cols + i % box_cols
+                for i in range(size)
+            ]
+            for box in range(size)
+        ]
+        return cls(regions, box_shape=(box_rows, box_cols))
+
+    @classmethod
+    def jigsaw(cls, region_map: str) -> "Layout":
+        """
+        The grid with irregular regions, drawn as one character per cell (see
+        `parse_map()`), e.g. "aabb aabb ccdd ccdd" for a 4x4 grid.
+        """
+        return cls(parse_map(region_map))
+
+    def with_cages(self, cages: Iterable[Cage]) -> "Layout":
+        """
+        Get the same grid with cages added, as for Killer Sudoku, e.g.
+        `Layout.classic().with_cages(zip(parse_map(cage_map), sums))`.
+        """
+        regions = self.units[2*self.size:]
+        return Layout(regions, (*self.cages, *cages), self.box_shape)
+
+    def is_killer(self) -> bool:
+        """
+        Whether the grid has cages.
+        """
+        return bool(self.cages)
+
+
+def parse_map(text: str) -> list[list[int]]:
+    """
+    Parse a map of a grid, with one character per cell in row-major order
+    (whitespace is ignored), into the groups of cells labeled the same, in
+    order of first appearance. A "." marks a cell in no group.
+    """
+    groups: dict[str, list[int]] = {}
+    index = 0
+    for char in text:
+        if char.isspace():
+            continue
+        if char != ".":
+            groups.setdefault(char, []).append(index)
+        index += 1
+    return list(groups.values())
+
+
+# The tables of the classic 9x9 game.
+CLASSIC = Layout.classic()
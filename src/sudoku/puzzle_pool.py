@@ -0,0 +1,82 @@
+import random
+import threading
+import time
+from collections import deque
+from typing import Optional, get_args
+
+from .board import Board
+from .generator import generate
+from .sudoku import Difficulty
+
+
+REFILL_PAUSE = 0.05     # Seconds between two generated puzzles.
+
+
+class PuzzlePool:
+    """
+    Keeps a few generated puzzles of each difficulty ready, so starting a new
+    game never waits for the generator. Once started, a background thread
+    refills the pool whenever a puzzle is taken out. It generates one puzzle
+    at a time, for the difficulty with the fewest ready, and pauses between
+    puzzles, so the game's own thread is not starved of the GIL.
+    """
+
+    def __init__(self, size: int = 3, rng: Optional[random.Random] = None) -> None:
+        self.__size = size
+        self.__rng = rng or random.Random()
+        self.__puzzles: dict[Difficulty, deque[Board]] = {
+            difficulty: deque() for difficulty in get_args(Difficulty)
+        }
+        self.__wakeup = threading.Event()
+        self.__started = False
+        self.__stopped = False
+        self.__thread = threading.Thread(target=self.__refill, name="puzzle-pool", daemon=True)
+
+    def start(self) -> None:
+        """
+        Start filling the pool in the background, unless already started. The
+        game does this when a puzzle may soon be needed rather than at launch,
+        to keep the generator from slowing down the start.
+        """
+        if not self.__started:
+            self.__started = True
+            self.__thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop filling the pool. The puzzle being generated, if any, is finished
+        first.
+        """
+        self.__stopped = True
+        self.__wakeup.set()
+
+    def pop(self, difficulty: Difficulty) -> Optional[Board]:
+        """
+        Take a ready puzzle out of the pool, or get `None` if there is none of
+        the difficulty yet.
+        """
+        try:
+            board = self.__puzzles[difficulty].popleft()
+        except IndexError:
+            board = None
+        self.__wakeup.set()
+        return board
+
+    def __len__(self) -> int:
+        return sum(len(puzzles) for puzzles in self.__puzzles.values())
+
+    def __refill(self) -> None:
+        """
+        Generate a puzzle for the difficulty with the fewest puzzles, one at a
+        time, and sleep while the pool is full.
+        """
+        while True:
+            self.__wakeup.clear()
+            if self.__stopped:
+                return
+            difficulty, puzzles = min(self.__puzzles.items(), key=lambda item: len(item[1]))
+            if len(puzzles) >= self.__size:
+                self.__wakeup.wait()
+                continue
+            puzzles.append(generate(difficulty, self.__rng))
+            time.sleep(REFILL_PAUSE)
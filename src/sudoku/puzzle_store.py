@@ -0,0 +1,165 @@
+import argparse
+import mmap
+import os
+import struct
+from collections.abc import Iterable
+from typing import Optional, get_args
+
+from .board import Board
+from .sudoku import Difficulty
+from .techniques import Grade, grade
+
+
+# File layout (little-endian):
+#   header: magic, version, record size (81 or 41), record count, index size
+#   index:  one entry per (difficulty, grade) with its first record and count
+#   records: sorted by (difficulty, grade), each 81 bytes with one digit per
+#            byte (0 for empty), or 41 bytes with two digits per byte (high
+#            nibble first)
+MAGIC = b"SDKP"
+VERSION = 1
+HEADER = struct.Struct("<4sHHII")
+INDEX_ENTRY = struct.Struct("<BBxxII")
+DIFFICULTIES: tuple[Difficulty, ...] = get_args(Difficulty)
+
+# The two digits packed in each byte.
+_UNPACKED = [bytes((byte >> 4, byte & 0xF)) for byte in range(256)]
+
+
+class PuzzleStore:
+    """
+    Read-only puzzle store file, memory-mapped so that reading a puzzle only
+    touches its own record.
+    """
+
+    def __init__(self, filename: str) -> None:
+        with open(filename, mode="rb") as fp:
+            self.__mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.__record_size, self.__count, index_size = \
+            HEADER.unpack_from(self.__mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{filename} is not a version {VERSION} puzzle store")
+
+        self.__index: dict[tuple[Difficulty, Grade], range] = {}
+        offset = HEADER.size
+        for _ in range(index_size):
+            difficulty, puzzle_grade, start, count = INDEX_ENTRY.unpack_from(self.__mmap, offset)
+            self.__index[(DIFFICULTIES[difficulty], Grade(puzzle_grade))] = range(start, start + count)
+            offset += INDEX_ENTRY.size
+        self.__records_offset = offset
+
+    def get(self, index: int) -> Board:
+        """
+        Read the `index`-th puzzle.
+        """
+        if not 0 <= index < self.__count:
+            raise IndexError(f"puzzle index out of range: {index}")
+        start = self.__records_offset + index * self.__record_size
+        record = self.__mmap[start:start + self.__record_size]
+        if self.__record_size == 81:
+            return Board(record)
+        return Board(b"".join(_UNPACKED[byte] for byte in record)[:81])
+
+    def indices(self, difficulty: Difficulty, puzzle_grade: Optional[Grade] = None) -> range:
+        """
+        Get the indices of the puzzles of a difficulty, and of a grade if given.
+        Records are sorted by difficulty and grade, so these are contiguous.
+        """
+        ranges = [
+            indices for (key_difficulty, key_grade), indices in self.__index.items()
+            if key_difficulty == difficulty and puzzle_grade in (None, key_grade)
+        ]
+        if not ranges:
+            return range(0)
+        return range(min(r.start for r in ranges), max(r.stop for r in ranges))
+
+    def close(self) -> None:
+        """
+        Unmap the file.
+        """
+        self.__mmap.close()
+
+    def __len__(self) -> int:
+        return self.__count
+
+    def __enter__(self) -> "PuzzleStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def write_store(
+    filename: str,
+    puzzles: Iterable[tuple[Board, Difficulty, Grade]],
+    packed: bool = False,
+) -> int:
+    """
+    Write puzzles to a store file, with 41-byte records if `packed`. Returns
+    the number of puzzles written.
+    """
+    buckets: dict[tuple[int, int], bytearray] = {}
+    for board, difficulty, puzzle_grade in puzzles:
+        key = (DIFFICULTIES.index(difficulty), int(puzzle_grade))
+        buckets.setdefault(key, bytearray()).extend(_pack(board) if packed else board.cells)
+
+    record_size = 41 if packed else 81
+    index, start = [], 0
+    for key in sorted(buckets):
+        count = len(buckets[key]) // record_size
+        index.append(INDEX_ENTRY.pack(*key, start, count))
+        start += count
+
+    with open(filename, mode="wb") as fp:
+        fp.write(HEADER.pack(MAGIC, VERSION, record_size, start, len(index)))
+        fp.writelines(index)
+        for key in sorted(buckets):
+            fp.write(buckets[key])
+    return start
+
+
+def convert(puzzle_dir: str, filename: str, packed: bool = False) -> int:
+    """
+    Convert a directory laid out like "data/puzzles" (one subdirectory of
+    9-line ".txt" files per difficulty) to a store file, grading every puzzle.
+    Returns the number of puzzles written.
+    """
+    def read_puzzles() -> Iterable[tuple[Board, Difficulty, Grade]]:
+        for difficulty in DIFFICULTIES:
+            difficulty_dir = os.path.join(puzzle_dir, difficulty)
+            if not os.path.isdir(difficulty_dir):
+                continue
+            for name in sorted(os.listdir(difficulty_dir)):
+                if not name.endswith(".txt"):
+                    continue
+                with open(os.path.join(difficulty_dir, name), mode="r") as fp:
+                    board = Board.from_string(fp.read())
+                yield board, difficulty, grade(board.cells)
+
+    return write_store(filename, read_puzzles(), packed)
+
+
+def _pack(board: Board) -> bytes:
+    """
+    Pack 81 digits into 41 bytes, two digits per byte.
+    """
+    cells = bytes(board.cells) + b"\0"
+    return bytes(cells[i] << 4 | cells[i + 1] for i in range(0, 82, 2))
+
+
+def main() -> None:
+    """
+    Convert a puzzle directory to a store file from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Convert a puzzle directory to a puzzle store.")
+    parser.add_argument("puzzle_dir", help='directory laid out like "data/puzzles"')
+    parser.add_argument("filename", help="store file to write")
+    parser.add_argument("--packed", action="store_true", help="use 41-byte nibble-packed records")
+    args = parser.parse_args()
+    count = convert(args.puzzle_dir, args.filename, args.packed)
+    print(f"Wrote {count} puzzles to {args.filename}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+import os
+import struct
+import threading
+import time
+from typing import NamedTuple, Optional
+
+from .action_stack import GROUPED_FLAG, INDEX_MASK, NEW_SHIFT, NOTES_FLAG, OLD_SHIFT, VALUE_MASK
+from .board import Board
+
+
+# File layout (little-endian):
+#   header:  magic, version, elapsed milliseconds, number of undo history
+#            entries, number of them applied
+#   board:   81 digits (0 for empty), then the clue bitmask in 11 bytes
+#   notes:   81 pencil mark masks of 2 bytes
+#   history: the packed undo history entries of 4 bytes, oldest first
+MAGIC = b"SDKS"
+VERSION = 1
+HEADER = struct.Struct("<4sHxxIII")
+CLUES_SIZE = 11
+NOTES = struct.Struct("<81H")
+HISTORY_ENTRY = struct.Struct("<I")
+ENTRY_BITS = INDEX_MASK | NOTES_FLAG | VALUE_MASK << OLD_SHIFT | VALUE_MASK << NEW_SHIFT | GROUPED_FLAG
+
+
+class Session(NamedTuple):
+    """
+    A game in progress.
+    """
+    board: Board                # The clues and the digits filled in.
+    notes: tuple[int, ...]      # The pencil marks of each cell in row-major order.
+    elapsed_ms: int             # The time on the timer.
+    history: bytes              # The undo history, as from `ActionStack.to_bytes()`.
+    applied: int                # The number of history entries not undone.
+
+
+def encode_session(session: Session) -> bytes:
+    """
+    Pack a session into its binary format.
+    """
+    board = session.board
+    return b"".join((
+        HEADER.pack(MAGIC, VERSION, session.elapsed_ms, len(session.history) // 4, session.applied),
+        board.cells,
+        board.clues.to_bytes(CLUES_SIZE, "little"),
+        NOTES.pack(*session.notes),
+        session.history,
+    ))
+
+
+def decode_session(data: bytes) -> Session:
+    """
+    Unpack a session from its binary format.
+    """
+    magic, version, elapsed_ms, history_size, applied = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"not a version {VERSION} session")
+
+    offset = HEADER.size
+    cells = data[offset:offset + 81]
+    offset += 81
+    clues = int.from_bytes(data[offset:offset + CLUES_SIZE], "little")
+    offset += CLUES_SIZE
+    notes = NOTES.unpack_from(data, offset)
+    offset += NOTES.size
+    history = data[offset:offset + 4 * history_size]
+    if len(history) != 4 * history_size:
+        raise ValueError("truncated session")
+
+    if len(cells) != 81 or max(cells) > 9:
+        raise ValueError("board digits must be 0 to 9")
+    if clues >> 81 or any(clues >> index & 1 and not digit for index, digit in enumerate(cells)):
+        raise ValueError("clues must be filled cells")
+    if any(mask > VALUE_MASK for mask in notes):
+        raise ValueError("pencil marks must be digits 1 to 9")
+    for entry, in HISTORY_ENTRY.iter_unpack(history):
+        _check_entry(entry)
+    if applied > history_size:
+        raise ValueError(f"{applied} history entries applied out of {history_size}")
+    return Session(Board(cells, clues), notes, elapsed_ms, history, applied)
+
+
+def _check_entry(entry: int) -> None:
+    """
+    Raise a `ValueError` if a packed history entry is not a change that
+    `ActionStack` could have made.
+    """
+    if entry & ~ENTRY_BITS:
+        raise ValueError(f"history entry {entry:#x} has unknown bits set")
+    if entry & INDEX_MASK > 80:
+        raise ValueError("history entry cell indices must be 0 to 80")
+    if not entry & NOTES_FLAG:
+        if entry >> OLD_SHIFT & VALUE_MASK > 9 or entry >> NEW_SHIFT & VALUE_MASK > 9:
+            raise ValueError("history entry digits must be 0 to 9")
+
+
+class SessionFile:
+    """
+    The file where the game in progress is saved. Saving is debounced and done
+    on a background thread: the file is written once no save has been asked
+    for during `delay_ms`, by replacing it atomically, so the game never waits
+    for the disk and a crash never leaves a torn file.
+    """
+
+    def __init__(self, filename: str, delay_ms: int = 500) -> None:
+        self.__filename = filename
+        self.__delay = delay_ms / 1000
+
+        # The data to write next, `None` to delete the file, or `_NOTHING` if
+        # the file is up to date; and the latest data saved in this run, which
+        # is what the file holds or is about to.
+        self.__pending: object = _NOTHING
+        self.__latest: object = _NOTHING
+        self.__due = 0.0
+        self.__stopped = False
+        self.__condition = threading.Condition()
+        self.__thread = threading.Thread(target=self.__write_pending, name="session-file", daemon=True)
+
+    def start(self) -> None:
+        """
+        Start writing saves in the background.
+        """
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background thread, writing the latest save (if any) first.
+        """
+        with self.__condition:
+            self.__stopped = True
+            self.__condition.notify()
+        if self.__thread.is_alive():
+            self.__thread.join()
+        self.__flush()
+
+    def save(self, session: Session) -> None:
+        """
+        Save a session soon.
+        """
+        self.__schedule(encode_session(session))
+
+    def discard(self) -> None:
+        """
+        Delete the saved session soon, e.g. when the game is over.
+        """
+        self.__schedule(None)
+
+    def load(self) -> Optional[Session]:
+        """
+        Get the saved session, including a save not written yet, or `None` if
+        there is none or the file is unreadable.
+        """
+        with self.__condition:
+            data = self.__latest
+        if data is None:
+            return None
+        if data is _NOTHING:
+            try:
+                with open(self.__filename, mode="rb") as fp:
+                    data = fp.read()
+            except OSError:
+                return None
+        try:
+            return decode_session(data)
+        except (ValueError, struct.error):
+            return None
+
+    def exists(self) -> bool:
+        """
+        Whether there is a saved session, including a save not written yet.
+        """
+        with self.__condition:
+            data = self.__latest
+        if data is _NOTHING:
+            return os.path.exists(self.__filename)
+        return data is not None
+
+    def __schedule(self, data: Optional[bytes]) -> None:
+        """
+        Make `data` the next thing written, after the delay.
+        """
+        with self.__condition:
+            self.__pending = self.__latest = data
+            self.__due = time.monotonic() + self.__delay
+            self.__condition.notify()
+
+    def __write_pending(self) -> None:
+        """
+        Write each save once it is due, until stopped.
+        """
+        while True:
+            with self.__condition:
+                while not self.__stopped:
+                    if self.__pending is _NOTHING:
+                        self.__condition.wait()
+                    elif (wait := self.__due - time.monotonic()) > 0:
+                        self.__condition.wait(wait)
+                    else:
+                        break
+                if self.__stopped:
+                    return
+            self.__flush()
+
+    def __flush(self) -> None:
+        """
+        Write the latest save now, if any.
+        """
+        with self.__condition:
+            data, self.__pending = self.__pending, _NOTHING
+        if data is _NOTHING:
+            return
+        if data is None:
+            if os.path.exists(self.__filename):
+                os.remove(self.__filename)
+            return
+
+        directory = os.path.dirname(self.__filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_filename = self.__filename + ".tmp"
+        with open(temp_filename, mode="wb") as fp:
+            fp.write(data)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(temp_filename, self.__filename)
+
+
+_NOTHING = object()
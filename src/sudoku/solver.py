@@ -0,0 +1,234 @@
+import random
+from collections.abc import Sequence
+from typing import Literal, Optional, Union
+
+from .board import Board
+from .sudoku import Sudoku
+from .tables import BOX_OF, COL_OF, ROW_OF, UNITS
+
+
+Backend = Literal["bitmask", "dlx"]
+
+# Candidate sets are 9-bit masks; bit `digit - 1` is set if `digit` is allowed.
+ALL_DIGITS = 0x1FF
+DIGIT_OF_BIT = {1 << i: i + 1 for i in range(9)}
+
+
+def solve(
+    sudoku: Union[Sudoku, Board],
+    max_solutions: int = 2,
+    backend: Backend = "bitmask",
+) -> list[Board]:
+    """
+    Find up to `max_solutions` solutions of the digits currently on the board.
+    With the default limit of 2, the puzzle has a unique solution if and only
+    if exactly one solution is returned.
+    """
+    board = sudoku.to_board() if isinstance(sudoku, Sudoku) else sudoku
+    return [
+        Board(solution, board.clues)
+        for solution in solve_cells(board.cells, max_solutions, backend)
+    ]
+
+
+def has_unique_solution(sudoku: Union[Sudoku, Board], backend: Backend = "bitmask") -> bool:
+    """
+    Whether the digits currently on the board lead to exactly one solution.
+    """
+    return len(solve(sudoku, max_solutions=2, backend=backend)) == 1
+
+
+def solve_cells(
+    cells: Sequence[int],
+    max_solutions: int = 2,
+    backend: Backend = "bitmask",
+    rng: Optional[random.Random] = None,
+) -> list[bytes]:
+    """
+    Find up to `max_solutions` solutions of 81 digits (0 for an empty cell) in
+    row-major order. The bitmask backend tries candidates in random order if
+    `rng` is given, which is how random solution grids are made.
+    """
+    cells = list(cells)
+    rows, cols, boxes = [0] * 9, [0] * 9, [0] * 9
+    for index, digit in enumerate(cells):
+        if not digit:
+            continue
+        bit = 1 << (digit - 1)
+        row, col, box = ROW_OF[index], COL_OF[index], BOX_OF[index]
+        if (rows[row] | cols[col] | boxes[box]) & bit:
+            return []   # The given digits already conflict.
+        rows[row] |= bit
+        cols[col] |= bit
+        boxes[box] |= bit
+
+    solutions: list[list[int]] = []
+    if backend == "bitmask":
+        _search(cells, rows, cols, boxes, solutions, max_solutions, rng)
+    elif backend == "dlx":
+        _search_exact_cover(cells, solutions, max_solutions)
+    else:
+        raise ValueError(f"unknown solver backend: {backend!r}")
+    return [bytes(solution) for solution in solutions]
+
+
+def _search(
+    cells: list[int],
+    rows: list[int],
+    cols: list[int],
+    boxes: list[int],
+    solutions: list[list[int]],
+    limit: int,
+    rng: Optional[random.Random],
+) -> None:
+    """
+    Fill in naked and hidden singles until stuck, then branch on the empty cell
+    with the fewest candidates. `rows`, `cols` and `boxes` hold the masks of
+    digits placed in each unit, and are modified in place along with `cells`.
+    """
+    while True:
+        progress = False
+        best, best_count, best_cands = -1, 10, 0
+
+        # Naked singles: cells with only one candidate left.
+        for index in range(81):
+            if cells[index]:
+                continue
+            row, col, box = ROW_OF[index], COL_OF[index], BOX_OF[index]
+            cands = ALL_DIGITS & ~(rows[row] | cols[col] | boxes[box])
+            if not cands:
+                return
+            if not cands & (cands - 1):
+                cells[index] = DIGIT_OF_BIT[cands]
+                rows[row] |= cands
+                cols[col] |= cands
+                boxes[box] |= cands
+                progress = True
+            elif (count := cands.bit_count()) < best_count:
+                best, best_count, best_cands = index, count, cands
+        if progress:
+            continue
+
+        if best < 0:
+            solutions.append(cells)
+            return
+
+        # Hidden singles: digits with only one possible cell left in a unit.
+        for unit_index, unit in enumerate(UNITS):
+            placed = (rows, cols, boxes)[unit_index // 9][unit_index % 9]
+            once = twice = 0
+            for index in unit:
+                if not cells[index]:
+                    cands = ALL_DIGITS & ~(
+                        rows[ROW_OF[index]] | cols[COL_OF[index]] | boxes[BOX_OF[index]]
+                    )
+                    twice |= once & cands
+                    once |= cands
+            if (once | placed) != ALL_DIGITS:
+                return  # Some digit has nowhere to go in this unit.
+            hidden = once & ~twice
+            while hidden:
+                bit = hidden & -hidden
+                hidden ^= bit
+                for index in unit:
+                    if cells[index]:
+                        continue
+                    row, col, box = ROW_OF[index], COL_OF[index], BOX_OF[index]
+                    if ~(rows[row] | cols[col] | boxes[box]) & bit:
+                        cells[index] = DIGIT_OF_BIT[bit]
+                        rows[row] |= bit
+                        cols[col] |= bit
+                        boxes[box] |= bit
+                        progress = True
+                        break
+        if not progress:
+            break
+
+    bits = [1 << i for i in range(9) if best_cands >> i & 1]
+    if rng is not None:
+        rng.shuffle(bits)
+    row, col, box = ROW_OF[best], COL_OF[best], BOX_OF[best]
+    for bit in bits:
+        new_cells, new_rows, new_cols, new_boxes = cells[:], rows[:], cols[:], boxes[:]
+        new_cells[best] = DIGIT_OF_BIT[bit]
+        new_rows[row] |= bit
+        new_cols[col] |= bit
+        new_boxes[box] |= bit
+        _search(new_cells, new_rows, new_cols, new_boxes, solutions, limit, rng)
+        if len(solutions) >= limit:
+            return
+
+
+# Exact cover formulation: choice `index*9 + digit - 1` puts a digit in a cell
+# and satisfies 4 of the 324 constraints (the cell is filled, and the digit
+# appears in its row, column and box).
+_CHOICE_CONSTRAINTS = tuple(
+    (
+        index,
+        81 + ROW_OF[index]*9 + digit,
+        162 + COL_OF[index]*9 + digit,
+        243 + BOX_OF[index]*9 + digit,
+    )
+    for index in range(81)
+    for digit in range(9)
+)
+_CONSTRAINT_CHOICES: dict[int, set[int]] = {constraint: set() for constraint in range(324)}
+for _choice, _constraints in enumerate(_CHOICE_CONSTRAINTS):
+    for _constraint in _constraints:
+        _CONSTRAINT_CHOICES[_constraint].add(_choice)
+
+
+def _search_exact_cover(cells: list[int], solutions: list[list[int]], limit: int) -> None:
+    """
+    Knuth's Algorithm X over the 324 Sudoku constraints. Covering and
+    uncovering work on a dict of sets, which is the Python counterpart of the
+    dancing links structure.
+    """
+    matrix = {constraint: set(choices) for constraint, choices in _CONSTRAINT_CHOICES.items()}
+    for index, digit in enumerate(cells):
+        if digit:
+            _cover(matrix, index*9 + digit - 1)
+
+    def search() -> None:
+        if not matrix:
+            solutions.append(cells[:])
+            return
+        constraint = min(matrix, key=lambda constraint: len(matrix[constraint]))
+        for choice in list(matrix[constraint]):
+            index, digit = divmod(choice, 9)
+            cells[index] = digit + 1
+            covered = _cover(matrix, choice)
+            search()
+            _uncover(matrix, choice, covered)
+            cells[index] = 0
+            if len(solutions) >= limit:
+                return
+
+    search()
+
+
+def _cover(matrix: dict[int, set[int]], choice: int) -> list[set[int]]:
+    """
+    Remove the constraints satisfied by a choice, along with every choice
+    clashing with it. Returns what was removed, for `_uncover()`.
+    """
+    covered = []
+    for constraint in _CHOICE_CONSTRAINTS[choice]:
+        for other in matrix[constraint]:
+            for other_constraint in _CHOICE_CONSTRAINTS[other]:
+                if other_constraint != constraint:
+                    matrix[other_constraint].remove(other)
+        covered.append(matrix.pop(constraint))
+    return covered
+
+
+def _uncover(matrix: dict[int, set[int]], choice: int, covered: list[set[int]]) -> None:
+    """
+    Undo `_cover()`.
+    """
+    for constraint in reversed(_CHOICE_CONSTRAINTS[choice]):
+        matrix[constraint] = covered.pop()
+        for other in matrix[constraint]:
+            for other_constraint in _CHOICE_CONSTRAINTS[other]:
+                if other_constraint != constraint:
+                    matrix[other_constraint].add(other)
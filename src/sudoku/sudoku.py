@@ -1,88 +1,158 @@
 import os
 import random
-from typing import Literal, Optional
+from array import array
+from typing import TYPE_CHECKING, Literal, Optional
 
+from .board import Board, CellPos
+from .tables import BOX_OF, CELL_UNITS, PEERS
+from .techniques import Step, find_hint
+from .transform import Transform
 
-CellPos = tuple[int, int]
-Difficulty = Literal["easy", "medium", "hard"]
+if TYPE_CHECKING:
+    import numpy as np
 
+    from .puzzle_store import PuzzleStore
 
-class _Cell:
-    """
-    A cell in Sudoku puzzle.
-    """
-    def __init__(self, char: str) -> None:
-        self.__digit = None if char == "." else int(char)
-        self.__is_clue = (self.__digit is not None)
 
-    @property
-    def digit(self) -> Optional[int]:
-        """
-        The digit inside the cell or `None` if empty. Setting this property will
-        have completely no effect if this cell is a clue.
-        """
-        return self.__digit
-
-    @digit.setter
-    def digit(self, new_digit: Optional[int]) -> None:
-        if not self.is_clue:
-            self.__digit = new_digit
+Difficulty = Literal["easy", "medium", "hard"]
+PuzzleSource = Literal["bundled", "generated"]
+Group = Literal["row", "col", "box"]
 
-    @property
-    def is_clue(self) -> bool:
-        """
-        Whether this cell is a clue. A cell is a clue if its digit is initially
-        given. Its digit cannot be altered.
-        """
-        return self.__is_clue
+# The order of the row, column and 3x3 box containing a cell.
+GROUP_ORDER: dict[Group, int] = {"row": 0, "col": 1, "box": 2}
 
 
 class Sudoku:
     """
     Classic 9x9 Sudoku puzzle.
     """
-    def __init__(self, difficulty: Difficulty = "easy", filename: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        difficulty: Difficulty = "easy",
+        filename: Optional[str] = None,
+        board: Optional[Board] = None,
+        source: PuzzleSource = "bundled",
+    ) -> None:
+        """
+        Load the puzzle from a file, or a randomly transformed bundled puzzle
+        with specified difficulty, or take over a board if given. If `source`
+        is "generated", a new puzzle of specified difficulty is generated
+        instead of picking one of the bundled files.
+        """
+        if board is None and filename is None and source == "generated":
+            from .generator import generate
+            board = generate(difficulty)
+        if board is None:
+            bundled = filename is None
+            if bundled:
+                puzzle_dir = f"data/puzzles/{difficulty}"
+                filename = os.path.join(puzzle_dir, random.choice(os.listdir(puzzle_dir)))
+            with open(filename, mode="r") as fp:
+                board = Board.from_string(fp.read())
+            # Serve one of the ~1.2 trillion equivalent variants of a bundled
+            # puzzle, so the few files make for practically endless games.
+            if bundled:
+                board = Transform.random().apply(board)
+
+        self.__board = board
+
+        # How many times each digit appears in each of the 27 groups (9 rows,
+        # then 9 columns, then 9 boxes), indexed as `counts[group][digit]`, and
+        # how many digits appear exactly once in each group. Along with the
+        # number of filled cells and of conflicts (extra occurrences of digits
+        # in groups), they are kept up to date by `set()`.
+        self.__counts = [[0] * 10 for _ in range(27)]
+        self.__singles = [0] * 27
+        self.__filled = 0
+        self.__conflicts = 0
+        self.__version = 0
+
+        # Pencil marks of each cell in row-major order, as 9-bit masks with bit
+        # `digit - 1` set for each noted digit.
+        self.__notes = array("H", bytes(2 * 81))
+
+        for row in range(9):
+            for col in range(9):
+                if (digit := self.get((row, col))) is not None:
+                    self.__count((row, col), digit, 1)
+
+    @classmethod
+    def from_store(cls, store: "PuzzleStore", index: int) -> "Sudoku":
         """
-        Load the puzzle from a file with specified difficulty.
+        Load the `index`-th puzzle of a puzzle store.
         """
-        if filename is None:
-            puzzle_dir = f"data/puzzles/{difficulty}"
-            filename = os.path.join(puzzle_dir, random.choice(os.listdir(puzzle_dir)))
-        with open(filename, mode="r") as fp:
-            board = fp.read().splitlines()
-
-        # TODO: Randomly shuffle rows and columns, and decide a random 1-to-1
-        # mapping from digits to digits, in order to produce more legal puzzles.
+        return cls(board=store.get(index))
 
-        self.__grid = [[_Cell(char) for char in line] for line in board]
+    @classmethod
+    def from_array(cls, array: "np.ndarray") -> "Sudoku":
+        """
+        Create a puzzle from a (9, 9) array of digits (0 for empty cells), with
+        every filled cell as a clue.
+        """
+        return cls(board=Board.from_array(array))
 
     def get(self, pos: CellPos) -> Optional[int]:
         """
         Get the digit inside a cell.
         """
-        row, col = pos
-        return self.__grid[row][col].digit
+        return self.__board.get(pos)
 
     def set(self, pos: CellPos, digit: Optional[int]) -> None:
         """
         Set the digit inside a cell.
         """
+        old_digit = self.__board.get(pos)
+        if self.__board.is_clue(pos) or old_digit == digit:
+            return
+        if old_digit is not None:
+            self.__count(pos, old_digit, -1)
+        self.__board.set(pos, digit)
+        if digit is not None:
+            self.__count(pos, digit, 1)
+        self.__version += 1
+
+    def get_notes(self, pos: CellPos) -> int:
+        """
+        Get the pencil marks of a cell, as a mask with bit `digit - 1` set for
+        each noted digit.
+        """
         row, col = pos
-        self.__grid[row][col].digit = digit
+        return self.__notes[row*9 + col]
+
+    def set_notes(self, pos: CellPos, notes: int) -> None:
+        """
+        Set the pencil marks of a cell. This has no effect if the cell is a clue.
+        """
+        if not self.__board.is_clue(pos):
+            row, col = pos
+            self.__notes[row*9 + col] = notes
+
+    def eliminate_note(self, pos: CellPos, digit: int) -> list[int]:
+        """
+        Remove a digit from the pencil marks of the 20 cells sharing a group
+        with the cell, e.g. after placing it there. Returns the indices
+        (`row*9 + col`) of the cells whose marks changed.
+        """
+        row, col = pos
+        bit = 1 << (digit - 1)
+        notes = self.__notes
+        changed = [peer for peer in PEERS[row*9 + col] if notes[peer] & bit]
+        for peer in changed:
+            notes[peer] &= ~bit
+        return changed
 
     def is_clue(self, pos: CellPos) -> bool:
         """
         Whether the cell is a clue.
         """
-        row, col = pos
-        return self.__grid[row][col].is_clue
+        return self.__board.is_clue(pos)
 
     def is_same_group(self, pos1: CellPos, pos2: CellPos) -> bool:
         """
         Whether two cells belong to the same group (row, column or 3x3 box).
         """
         (row1, col1), (row2, col2) = pos1, pos2
-        return row1 == row2 or col1 == col2 or (row1//3, col1//3) == (row2//3, col2//3)
+        return row1 == row2 or col1 == col2 or BOX_OF[row1*9 + col1] == BOX_OF[row2*9 + col2]
 
     def has_valid_digit(self, pos: CellPos) -> bool:
         """
@@ -91,60 +161,76 @@ def has_valid_digit(self, pos: CellPos) -> bool:
         """
         if (digit := self.get(pos)) is None:
             return True
+        return all(self.__counts[group][digit] == 1 for group in self.__groups_of(pos))
 
-        for npos in (
-            self.__row_pos_list(pos) + \
-            self.__col_pos_list(pos) + \
-            self.__box_pos_list(pos)
-        ):
-            if npos != pos and self.get(npos) == digit:
-                return False
-        return True
+    def is_group_complete(self, pos: CellPos, group: Group) -> bool:
+        """
+        Whether the row, column or 3x3 box containing the cell holds all 9
+        digits exactly once.
+        """
+        return self.__singles[self.__groups_of(pos)[GROUP_ORDER[group]]] == 9
+
+    def find_hint(self) -> list[Step]:
+        """
+        Find the logical deductions leading to the next digit which can be
+        placed, from the digits filled in so far (see `techniques.find_hint()`).
+        Returns no steps if some digits conflict or logic alone gets stuck.
+        """
+        if self.__conflicts:
+            return []
+        return find_hint(self.__board.cells)
 
     def is_solved(self) -> bool:
         """
         Whether the puzzle has been solved.
         """
-        def has_9_digits(digits: set[Optional[int]]) -> bool:
-            return None not in digits and len(digits) == 9
-
-        ROWS = [0, 1, 2, 3, 4, 5, 6, 7, 8]
-        COLS = [0, 3, 6, 1, 4, 7, 2, 5, 8]
-        for pos in zip(ROWS, COLS):
-            row_digits = set(self.get(npos) for npos in self.__row_pos_list(pos))
-            col_digits = set(self.get(npos) for npos in self.__col_pos_list(pos))
-            box_digits = set(self.get(npos) for npos in self.__box_pos_list(pos))
-            if not (
-                has_9_digits(row_digits) and has_9_digits(col_digits) and has_9_digits(box_digits)
-            ):
-                return False
-        return True
+        return self.__filled == 81 and self.__conflicts == 0
 
     def reset(self) -> None:
         """
-        Reset the puzzle.
+        Reset the puzzle, clearing its pencil marks too.
         """
         for row in range(9):
             for col in range(9):
                 self.set((row, col), digit=None)
+        self.__notes = array("H", bytes(2 * 81))
+
+    def to_board(self) -> Board:
+        """
+        Get a snapshot of the puzzle as a compact board.
+        """
+        return self.__board.copy()
 
-    def __row_pos_list(self, pos: CellPos) -> list[CellPos]:
+    def to_array(self) -> "np.ndarray":
         """
-        Get the positions of cells within the same row as the given cell.
+        Get a read-only (9, 9) uint8 array view of the digits, without copying.
+        It reflects later changes to the puzzle.
         """
-        row, _ = pos
-        return [(row, i) for i in range(9)]
+        return self.__board.to_array()
 
-    def __col_pos_list(self, pos: CellPos) -> list[CellPos]:
+    def __count(self, pos: CellPos, digit: int, delta: int) -> None:
         """
-        Get the positions of cells within the same column as the given cell.
+        Add `delta` to the counts of a digit in the groups containing the cell.
         """
-        _, col = pos
-        return [(i, col) for i in range(9)]
+        self.__filled += delta
+        for group in self.__groups_of(pos):
+            counts = self.__counts[group]
+            old_count, new_count = counts[digit], counts[digit] + delta
+            counts[digit] = new_count
+            self.__singles[group] += (new_count == 1) - (old_count == 1)
+            self.__conflicts += max(new_count - 1, 0) - max(old_count - 1, 0)
 
-    def __box_pos_list(self, pos: CellPos) -> list[CellPos]:
+    def __groups_of(self, pos: CellPos) -> tuple[int, int, int]:
         """
-        Get the positions of cells within the same 3x3 box as the given cell.
+        Get the indices of the row, column and 3x3 box containing the cell.
         """
         row, col = pos
-        return [(row//3*3+i, col//3*3+j) for i in range(3) for j in range(3)]
+        return CELL_UNITS[row*9 + col]
+
+    @property
+    def version(self) -> int:
+        """
+        Number of times a digit has been changed. Compare it before and after
+        handling an input to tell whether the puzzle was edited.
+        """
+        return self.__version
@@ -16,65 +16,44 @@
     K_LEFT,
     K_RIGHT,
     K_UP,
+    K_n,
 )
 
-from .sudoku import CellPos, Sudoku
+from .action_stack import ActionStack
+from .sudoku import Sudoku
+from .techniques import Step
+from ..utils import glyph_cache, mouse
 
 
 CELL_SIZE = 70
 GRID_SIZE = CELL_SIZE * 9
 MARGIN_SIZE = (900 - GRID_SIZE) / 2
 
-EDIT_KEYS = [K_BACKSPACE, K_1, K_2, K_3, K_4, K_5, K_6, K_7, K_8, K_9]
-
-
-class Action:
-    def __init__(self, sudoku: Sudoku, pos: CellPos, digit: Optional[int]) -> None:
-        self.__sudoku = sudoku
-        self.__pos = pos
-        self.__old_digit = sudoku.get(pos)
-        self.__new_digit = digit
-
-    def execute(self) -> None:
-        self.__sudoku.set(self.__pos, self.__new_digit)
+DIGIT_COLORS = ["black", "blue", "red"]   # Clue, valid and invalid digits.
 
-    def undo(self) -> None:
-        self.__sudoku.set(self.__pos, self.__old_digit)
-
-
-class ActionStack:
-    def __init__(self) -> None:
-        self.__actions: list[Action] = []
-        self.__current = -1     # Index of the last executed action.
+EDIT_KEYS = [K_BACKSPACE, K_1, K_2, K_3, K_4, K_5, K_6, K_7, K_8, K_9]
 
-    def push(self, action: Action) -> None:
-        self.__current += 1
-        self.__actions = self.__actions[:self.__current]
-        self.__actions.append(action)
-        action.execute()
+NOTE_SIZE = 20
+NOTE_COLOR = "gray40"
+NOTE_MODE_KEY = K_n
 
-    def undo(self) -> None:
-        if self.__current < 0:
-            return
-        self.__actions[self.__current].undo()
-        self.__current -= 1
+HINT_COLOR = "palegreen3"           # The cell a hint places a digit in.
+HINT_REASON_COLOR = "darkseagreen1"  # The cells the hint's deductions are based on.
 
-    def redo(self) -> None:
-        if self.__current + 1 >= len(self.__actions):
-            return
-        self.__current += 1
-        self.__actions[self.__current].execute()
+# What a cell looks like: (cell color, digit, digit color, pencil marks).
+CellLook = tuple[str, Optional[int], Optional[str], int]
 
-    def reset(self) -> None:
-        self.__actions.clear()
-        self.__current = -1
+HISTORY_SIZE = 10000    # Edits kept for undo.
+COALESCE_MS = 500       # Rapid edits of one cell are undone as one.
 
 
 class SudokuGuiWrapper(pygame.sprite.Sprite):
     """
     Display a Sudoku puzzle on the monitor. The cell selected by user (if any)
     is highlighted. The other cells belonging to the same group as the selected
-    cell are also highlighted but with a different color.
+    cell are also highlighted but with a different color. Pencil marks are
+    shown in empty cells; in note mode, digit keys toggle marks instead of
+    placing digits. A hint is highlighted until the next input.
     """
 
     def __init__(self, sudoku: Sudoku, **kwargs) -> None:
@@ -101,63 +80,92 @@ def __init__(self, sudoku: Sudoku, **kwargs) -> None:
         self.__sudoku = sudoku
         self.__pos: Optional[tuple[int, int]] = None   # The selected cell position.
 
-        self.font = pygame.font.SysFont("Futura", size=30)
+        # The cell index of the hint shown (if any), and of the cells its
+        # deductions are based on.
+        self.__hint: Optional[tuple[int, frozenset[int]]] = None
 
-        self.__action_stack = ActionStack()
+        glyph_cache.preload([str(digit) for digit in range(1, 10)], colors=DIGIT_COLORS)
+        glyph_cache.preload(
+            [str(digit) for digit in range(1, 10)], size=NOTE_SIZE, colors=[NOTE_COLOR]
+        )
 
-    def update(self) -> None:
+        # The pencil marks of a cell, composed once per combination of marks,
+        # so a cell full of marks costs one blit.
+        self.__note_surfaces: dict[int, pygame.Surface] = {}
+        self.__note_mode = False
+
+        self.__action_stack = ActionStack(sudoku, HISTORY_SIZE, COALESCE_MS)
+
+        # What each cell currently looks like on `image`. Only cells whose look
+        # changes are repainted, and their rects are queued in `__dirty_rects`.
+        self.__cell_looks: list[list[Optional[CellLook]]] = [[None] * 9 for _ in range(9)]
+        self.__dirty_rects: list[pygame.Rect] = []
+        self.__needs_refresh = True
         self.image.fill("white")
 
-        # Draw the cell rects.
+    def update(self) -> None:
+        if not self.__needs_refresh:
+            return
+        self.__needs_refresh = False
+
+        repainted = False
         for row, row_of_cell_rects in enumerate(self.__cell_rects):
             for col, cell_rect in enumerate(row_of_cell_rects):
-                pygame.draw.rect(self.image, self.__choose_cell_color(row, col), cell_rect)
-                # Draw the digit text.
-                if (digit := self.sudoku.get((row, col))) is None:
+                look = self.__get_cell_look(row, col)
+                if look == self.__cell_looks[row][col]:
                     continue
-                text = self.font.render(str(digit), True, self.__choose_digit_color(row, col))
-                text_rect = text.get_rect(center=cell_rect.center)
-                self.image.blit(text, text_rect)
+                self.__cell_looks[row][col] = look
+                self.__draw_cell(cell_rect, look)
+                self.__dirty_rects.append(cell_rect.move(self.rect.topleft))
+                repainted = True
 
-        # Draw the horizontal and vertical lines.
-        start, end = MARGIN_SIZE, MARGIN_SIZE + GRID_SIZE
-        for i in range(10):
-            if i % 3 == 0:
-                continue
-            stop = MARGIN_SIZE + CELL_SIZE * i
-            pygame.draw.line(self.image, "gray", (start, stop), (end, stop), width=3)
-            pygame.draw.line(self.image, "gray", (stop, start), (stop, end), width=3)
-        for i in [0, 3, 6, 9]:
-            stop = MARGIN_SIZE + CELL_SIZE * i
-            pygame.draw.line(self.image, "black", (start, stop), (end, stop), width=3)
-            pygame.draw.line(self.image, "black", (stop, start), (stop, end), width=3)
+        # Repainting a cell covers the grid lines along its edges.
+        if repainted:
+            self.__draw_grid_lines()
+
+    def pop_dirty_rects(self) -> list[pygame.Rect]:
+        """
+        Get the areas (in display surface coordinates) repainted since the last
+        call, and forget about them.
+        """
+        dirty_rects, self.__dirty_rects = self.__dirty_rects, []
+        return dirty_rects
 
     def handle_mouse_event(self) -> None:
         """
         Move the selected position based on where user clicked.
         """
-        mouse_pos = pygame.mouse.get_pos()
-        for row, row_of_cell_rects in enumerate(self.__cell_rects):
-            for col, cell_rect in enumerate(row_of_cell_rects):
-                if cell_rect.collidepoint(mouse_pos):
-                    self.__pos = (row, col)
-                    return
-        self.__pos = None
+        self.__needs_refresh = True
+        self.__hint = None
+        x, y = mouse.get_pos()
+        col = int((x - self.rect.left - MARGIN_SIZE) // CELL_SIZE)
+        row = int((y - self.rect.top - MARGIN_SIZE) // CELL_SIZE)
+        self.__pos = (row, col) if 0 <= row < 9 and 0 <= col < 9 else None
 
     def handle_key_event(self, key: int) -> None:
         """
-        Based on which key user pressed, move the selected position or set digit inside the selected cell.
+        Based on which key user pressed, move the selected position, set digit
+        inside the selected cell, toggle a pencil mark, or toggle note mode.
         """
+        if self.__hint is not None:
+            self.__hint = None
+            self.__needs_refresh = True
+        if key == NOTE_MODE_KEY:
+            self.__note_mode = not self.__note_mode
+            self.__needs_refresh = True
+            return
         if self.__pos is None:
             return
-
-        try:
-            index = EDIT_KEYS.index(key)
-            digit = None if index == 0 else index
-            self.__action_stack.push(Action(self.__sudoku, self.__pos, digit))
+        self.__needs_refresh = True
+
+        if key in EDIT_KEYS:
+            digit = EDIT_KEYS.index(key) or None
+            if not self.__note_mode:
+                self.__action_stack.push(self.__pos, digit)
+            elif self.__sudoku.get(self.__pos) is None:
+                notes = 0 if digit is None else self.__sudoku.get_notes(self.__pos) ^ 1 << (digit - 1)
+                self.__action_stack.push_notes(self.__pos, notes)
             return
-        except:
-            pass
 
         row, col = self.__pos
         if key == K_UP:
@@ -172,22 +180,109 @@ def handle_key_event(self, key: int) -> None:
 
     def undo(self) -> None:
         self.__action_stack.undo()
+        self.__hint = None
+        self.__needs_refresh = True
 
     def redo(self) -> None:
         self.__action_stack.redo()
+        self.__hint = None
+        self.__needs_refresh = True
 
     def reset(self) -> None:
         self.__sudoku.reset()
         self.__action_stack.reset()
+        self.__hint = None
+        self.__needs_refresh = True
+
+    def show_hint(self) -> list[Step]:
+        """
+        Highlight the next cell which can be filled in by logic, and the cells
+        of the deductions leading to it. Returns the deductions, or no steps if
+        there is no hint (see `Sudoku.find_hint()`).
+        """
+        steps = self.__sudoku.find_hint()
+        self.__needs_refresh = True
+        if not steps:
+            self.__hint = None
+            return steps
+        (target, _), = steps[-1].placements
+        reasons = frozenset(index for step in steps for index in step.cells) - {target}
+        self.__hint = target, reasons
+        return steps
+
+    def __get_cell_look(self, row: int, col: int) -> CellLook:
+        """
+        Get what a cell should look like.
+        """
+        digit = self.sudoku.get((row, col))
+        if digit is None:
+            return self.__choose_cell_color(row, col), None, None, self.sudoku.get_notes((row, col))
+        return self.__choose_cell_color(row, col), digit, self.__choose_digit_color(row, col), 0
+
+    def __draw_cell(self, cell_rect: pygame.Rect, look: CellLook) -> None:
+        """
+        Draw a cell rect and the digit or pencil marks inside it.
+        """
+        cell_color, digit, digit_color, notes = look
+        pygame.draw.rect(self.image, cell_color, cell_rect)
+        if digit is None:
+            if notes:
+                self.image.blit(self.__get_note_surface(notes), cell_rect)
+            return
+        text = glyph_cache.render(str(digit), color=digit_color)
+        text_rect = text.get_rect(center=cell_rect.center)
+        self.image.blit(text, text_rect)
+
+    def __get_note_surface(self, notes: int) -> pygame.Surface:
+        """
+        Get a transparent cell-sized surface with pencil marks laid out 3x3, in
+        order from 1 at the top left to 9 at the bottom right.
+        """
+        if (surface := self.__note_surfaces.get(notes)) is not None:
+            return surface
+
+        surface = pygame.Surface((CELL_SIZE, CELL_SIZE), pygame.SRCALPHA)
+        spot_size = CELL_SIZE / 3
+        for digit in range(1, 10):
+            if not notes >> (digit - 1) & 1:
+                continue
+            row, col = divmod(digit - 1, 3)
+            text = glyph_cache.render(str(digit), size=NOTE_SIZE, color=NOTE_COLOR)
+            center = (spot_size * (col + 0.5), spot_size * (row + 0.5))
+            surface.blit(text, text.get_rect(center=center))
+        self.__note_surfaces[notes] = surface
+        return surface
+
+    def __draw_grid_lines(self) -> None:
+        """
+        Draw the horizontal and vertical lines.
+        """
+        start, end = MARGIN_SIZE, MARGIN_SIZE + GRID_SIZE
+        for i in range(10):
+            if i % 3 == 0:
+                continue
+            stop = MARGIN_SIZE + CELL_SIZE * i
+            pygame.draw.line(self.image, "gray", (start, stop), (end, stop), width=3)
+            pygame.draw.line(self.image, "gray", (stop, start), (stop, end), width=3)
+        for i in [0, 3, 6, 9]:
+            stop = MARGIN_SIZE + CELL_SIZE * i
+            pygame.draw.line(self.image, "black", (start, stop), (end, stop), width=3)
+            pygame.draw.line(self.image, "black", (stop, start), (stop, end), width=3)
 
     def __choose_cell_color(self, row: int, col: int) -> str:
         """
         Choose the color of a cell.
         """
+        if self.__hint is not None:
+            target, reasons = self.__hint
+            if row*9 + col == target:
+                return HINT_COLOR
+            if row*9 + col in reasons:
+                return HINT_REASON_COLOR
         if self.__pos is None:
             return "white"
         if self.__pos == (row, col):
-            return "azure4"
+            return "lightgoldenrod3" if self.__note_mode else "azure4"
 
         selected_digit = self.sudoku.get(self.__pos)
         if self.sudoku.get((row, col)) == selected_digit and selected_digit is not None:
@@ -204,6 +299,13 @@ def __choose_digit_color(self, row: int, col: int) -> str:
             return "black"
         return "blue" if self.sudoku.has_valid_digit((row, col)) else "red"
 
+    @property
+    def action_stack(self) -> ActionStack:
+        """
+        The undo/redo history of the current puzzle.
+        """
+        return self.__action_stack
+
     @property
     def sudoku(self) -> Sudoku:
         """
@@ -215,4 +317,7 @@ def sudoku(self) -> Sudoku:
     @sudoku.setter
     def sudoku(self, new_sudoku: Sudoku) -> Sudoku:
         self.__sudoku = new_sudoku
+        self.__action_stack = ActionStack(new_sudoku, HISTORY_SIZE, COALESCE_MS)
         self.__pos = None
+        self.__hint = None
+        self.__needs_refresh = True
@@ -0,0 +1,33 @@
+# Static lookup tables for the classic 9x9 grid, built once at import. Cells are
+# numbered 0 to 80 in row-major order, i.e. cell `row*9 + col`. They are the
+# tables of the classic layout (see `Layout`), as module constants so the hot
+# paths of the classic game read them without attribute lookups.
+
+from .layout import CLASSIC
+
+ROW_OF = CLASSIC.row_of
+COL_OF = CLASSIC.col_of
+BOX_OF = CLASSIC.region_of
+
+# The 27 units (9 rows, then 9 columns, then 9 3x3 boxes), each listing its 9
+# cells.
+UNITS = CLASSIC.units
+
+# The row, column and box units containing each cell.
+CELL_UNITS = CLASSIC.cell_units
+
+# The 20 other cells sharing a unit with each cell.
+PEERS = CLASSIC.peers
+
+# The 54 intersections of a box with a row or column, each as (the 3 cells they
+# share, the other 6 cells of the box, the other 6 cells of the line).
+INTERSECTIONS = tuple(
+    (
+        tuple(index for index in box if index in line),
+        tuple(index for index in box if index not in line),
+        tuple(index for index in line if index not in box),
+    )
+    for box in UNITS[18:]
+    for line in UNITS[:18]
+    if set(box) & set(line)
+)
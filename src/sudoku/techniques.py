@@ -0,0 +1,327 @@
+import itertools
+from collections.abc import Sequence
+from enum import IntEnum
+from typing import NamedTuple, Optional
+
+from .tables import INTERSECTIONS, PEERS, UNITS
+
+
+ALL_DIGITS = 0x1FF      # Candidate sets are 9-bit masks, bit `digit - 1` for `digit`.
+
+
+class Grade(IntEnum):
+    """
+    How hard a puzzle is, by the hardest technique needed to solve it.
+    """
+    HIDDEN_SINGLES = 0
+    NAKED_SINGLES = 1
+    INTERSECTIONS = 2
+    SUBSETS = 3
+    FISH = 4
+    GUESSING = 5
+
+
+class Step(NamedTuple):
+    """
+    One logical deduction. Cells are numbered 0 to 80 in row-major order.
+    """
+    technique: str
+    grade: Grade
+    placements: tuple[tuple[int, int], ...]     # (cell, digit) to fill in.
+    eliminations: tuple[tuple[int, int], ...]   # (cell, digit) to rule out.
+    cells: tuple[int, ...]                      # The cells the deduction is based on.
+
+
+def get_candidates(cells: Sequence[int]) -> list[int]:
+    """
+    Get the candidate mask of every cell (0 for filled cells), ruling out the
+    digits placed in its peers.
+    """
+    cands = [0] * 81
+    for index in range(81):
+        if cells[index]:
+            continue
+        used = 0
+        for peer in PEERS[index]:
+            if cells[peer]:
+                used |= 1 << (cells[peer] - 1)
+        cands[index] = ALL_DIGITS & ~used
+    return cands
+
+
+def find_step(cells: Sequence[int], cands: Sequence[int]) -> Optional[Step]:
+    """
+    Find the easiest deduction available, or `None` if none of the known
+    techniques applies.
+    """
+    for technique in TECHNIQUES:
+        if (step := technique(cells, cands)) is not None:
+            return step
+    return None
+
+
+def apply_step(cells: list[int], cands: list[int], step: Step) -> None:
+    """
+    Carry out a deduction, updating `cells` and `cands` in place.
+    """
+    for index, digit in step.placements:
+        cells[index] = digit
+        cands[index] = 0
+        for peer in PEERS[index]:
+            cands[peer] &= ~(1 << (digit - 1))
+    for index, digit in step.eliminations:
+        cands[index] &= ~(1 << (digit - 1))
+
+
+def find_hint(cells: Sequence[int], max_steps: int = 81) -> list[Step]:
+    """
+    Find the deductions leading to the next digit which can be placed by logic:
+    any number of eliminations, then one placement, each found with the
+    easiest technique available. Returns no steps if logic alone gets stuck.
+    """
+    cells = list(cells)
+    cands = get_candidates(cells)
+    steps = []
+    for _ in range(max_steps):
+        if (step := find_step(cells, cands)) is None:
+            break
+        steps.append(step)
+        if step.placements:
+            return steps
+        apply_step(cells, cands, step)
+    return []
+
+
+def grade(cells: Sequence[int]) -> Grade:
+    """
+    Solve a puzzle step by step, always with the easiest technique available,
+    and get the grade of the hardest technique used. A puzzle which cannot be
+    finished by logic alone is graded `Grade.GUESSING`.
+    """
+    cells = list(cells)
+    cands = get_candidates(cells)
+    hardest = Grade.HIDDEN_SINGLES
+    while 0 in cells:
+        if (step := find_step(cells, cands)) is None:
+            return Grade.GUESSING
+        hardest = max(hardest, step.grade)
+        apply_step(cells, cands, step)
+    return hardest
+
+
+def _bits(mask: int) -> list[int]:
+    """
+    Get the digits in a candidate mask.
+    """
+    return [i + 1 for i in range(9) if mask >> i & 1]
+
+
+def _naked_single(cells: Sequence[int], cands: Sequence[int]) -> Optional[Step]:
+    """
+    A cell with only one candidate left.
+    """
+    for index in range(81):
+        mask = cands[index]
+        if mask and not mask & (mask - 1):
+            digit = mask.bit_length()
+            return Step("naked single", Grade.NAKED_SINGLES, ((index, digit),), (), (index,))
+    return None
+
+
+def _hidden_single(cells: Sequence[int], cands: Sequence[int]) -> Optional[Step]:
+    """
+    A digit with only one possible cell left in a unit.
+    """
+    for unit in UNITS:
+        once = twice = 0
+        for index in unit:
+            twice |= once & cands[index]
+            once |= cands[index]
+        if not (hidden := once & ~twice):
+            continue
+        bit = hidden & -hidden
+        for index in unit:
+            if cands[index] & bit:
+                placement = (index, bit.bit_length())
+                return Step("hidden single", Grade.HIDDEN_SINGLES, (placement,), (), unit)
+    return None
+
+
+def _locked_candidates(cells: Sequence[int], cands: Sequence[int]) -> Optional[Step]:
+    """
+    A digit confined to the intersection of a box and a line within one of
+    them, which rules it out from the rest of the other.
+    """
+    for shared, rest_of_box, rest_of_line in INTERSECTIONS:
+        in_shared = cands[shared[0]] | cands[shared[1]] | cands[shared[2]]
+        if not in_shared:
+            continue
+        in_box = in_line = 0
+        for index in rest_of_box:
+            in_box |= cands[index]
+        for index in rest_of_line:
+            in_line |= cands[index]
+        # Digits pointing out of the box along the line, then digits claimed by
+        # the line within the box.
+        for locked, others in ((in_shared & in_line & ~in_box, rest_of_line),
+                               (in_shared & in_box & ~in_line, rest_of_box)):
+            if not locked:
+                continue
+            bit = locked & -locked
+            digit = bit.bit_length()
+            eliminations = tuple((index, digit) for index in others if cands[index] & bit)
+            places = tuple(index for index in shared if cands[index] & bit)
+            return Step("locked candidates", Grade.INTERSECTIONS, (), eliminations, places)
+    return None
+
+
+def _naked_pair(cells: Sequence[int], cands: Sequence[int]) -> Optional[Step]:
+    """
+    Two cells in a unit with the same two candidates, which rules out those
+    digits from the rest of the unit.
+    """
+    for unit in UNITS:
+        pairs: dict[int, int] = {}
+        for index in unit:
+            mask = cands[index]
+            if mask.bit_count() != 2:
+                continue
+            if (first := pairs.get(mask)) is None:
+                pairs[mask] = index
+                continue
+            eliminations = tuple(
+                (other, digit) for other in unit if other not in (first, index)
+                for digit in _bits(cands[other] & mask)
+            )
+            if eliminations:
+                return Step("naked pair", Grade.SUBSETS, (), eliminations, (first, index))
+    return None
+
+
+def _hidden_pair(cells: Sequence[int], cands: Sequence[int]) -> Optional[Step]:
+    """
+    Two digits confined to the same two cells of a unit, which rules out every
+    other candidate from those cells.
+    """
+    for unit in UNITS:
+        digits_by_places: dict[int, int] = {}
+        for digit, place_mask in enumerate(_place_masks(unit, cands), start=1):
+            if place_mask.bit_count() != 2:
+                continue
+            if (first := digits_by_places.get(place_mask)) is None:
+                digits_by_places[place_mask] = digit
+                continue
+            pair = tuple(index for i, index in enumerate(unit) if place_mask >> i & 1)
+            mask = 1 << (first - 1) | 1 << (digit - 1)
+            eliminations = tuple(
+                (index, other) for index in pair for other in _bits(cands[index] & ~mask)
+            )
+            if eliminations:
+                return Step("hidden pair", Grade.SUBSETS, (), eliminations, pair)
+    return None
+
+
+def _naked_triple(cells: Sequence[int], cands: Sequence[int]) -> Optional[Step]:
+    """
+    Three cells in a unit with only the same three candidates between them,
+    which rules out those digits from the rest of the unit.
+    """
+    for unit in UNITS:
+        open_cells = [index for index in unit if 2 <= cands[index].bit_count() <= 3]
+        for triple in itertools.combinations(open_cells, 3):
+            mask = cands[triple[0]] | cands[triple[1]] | cands[triple[2]]
+            if mask.bit_count() != 3:
+                continue
+            eliminations = tuple(
+                (other, digit) for other in unit if other not in triple
+                for digit in _bits(cands[other] & mask)
+            )
+            if eliminations:
+                return Step("naked triple", Grade.SUBSETS, (), eliminations, triple)
+    return None
+
+
+def _hidden_triple(cells: Sequence[int], cands: Sequence[int]) -> Optional[Step]:
+    """
+    Three digits confined to the same three cells of a unit, which rules out
+    every other candidate from those cells.
+    """
+    for unit in UNITS:
+        places = {
+            digit: place_mask
+            for digit, place_mask in enumerate(_place_masks(unit, cands), start=1)
+            if 2 <= place_mask.bit_count() <= 3
+        }
+        for digits in itertools.combinations(places, 3):
+            place_mask = places[digits[0]] | places[digits[1]] | places[digits[2]]
+            if place_mask.bit_count() != 3:
+                continue
+            triple = tuple(index for i, index in enumerate(unit) if place_mask >> i & 1)
+            mask = sum(1 << (digit - 1) for digit in digits)
+            eliminations = tuple(
+                (index, other) for index in triple for other in _bits(cands[index] & ~mask)
+            )
+            if eliminations:
+                return Step("hidden triple", Grade.SUBSETS, (), eliminations, triple)
+    return None
+
+
+def _x_wing(cells: Sequence[int], cands: Sequence[int]) -> Optional[Step]:
+    """
+    A digit confined to the same two columns in two rows (or the same two rows
+    in two columns), which rules it out from the rest of those columns (rows).
+    """
+    # The `i`-th cell of a row is in column `i`, and vice versa, so where a
+    # digit may go in a line is also the mask of lines crossing it there.
+    places = [_place_masks(unit, cands) for unit in UNITS[:18]]
+    for digit in range(1, 10):
+        bit = 1 << (digit - 1)
+        for base, cover_base in ((0, 9), (9, 0)):
+            lines: dict[int, int] = {}
+            for line in range(base, base + 9):
+                covers = places[line][digit - 1]
+                if covers.bit_count() != 2:
+                    continue
+                if (other := lines.get(covers)) is None:
+                    lines[covers] = line
+                    continue
+                corners = tuple(
+                    index for unit in (other, line) for i, index in enumerate(UNITS[unit])
+                    if covers >> i & 1
+                )
+                eliminations = tuple(
+                    (index, digit) for i in range(9) if covers >> i & 1
+                    for index in UNITS[cover_base + i]
+                    if index not in corners and cands[index] & bit
+                )
+                if eliminations:
+                    return Step("x-wing", Grade.FISH, (), eliminations, corners)
+    return None
+
+
+def _place_masks(unit: Sequence[int], cands: Sequence[int]) -> list[int]:
+    """
+    Get where each digit may go in a unit: entry `digit - 1` has bit `i` set
+    if the `i`-th cell of the unit has the digit as a candidate.
+    """
+    places = [0] * 9
+    for i, index in enumerate(unit):
+        mask = cands[index]
+        while mask:
+            bit = mask & -mask
+            places[bit.bit_length() - 1] |= 1 << i
+            mask ^= bit
+    return places
+
+
+# In order of difficulty.
+TECHNIQUES = [
+    _hidden_single,
+    _naked_single,
+    _locked_candidates,
+    _naked_pair,
+    _hidden_pair,
+    _naked_triple,
+    _hidden_triple,
+    _x_wing,
+]
@@ -0,0 +1,137 @@
+import itertools
+import math
+import random
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Optional, Union
+
+from .board import Board, require_numpy
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+PERMUTATIONS_3 = list(itertools.permutations(range(3)))
+
+# Number of distinct transforms: transpose or not, 6 orders of bands and of
+# stacks, 6 orders of rows (columns) within each band (stack), and 9! ways to
+# relabel the digits.
+COUNT = 2 * 6**8 * math.factorial(9)
+
+
+class Transform:
+    """
+    A transformation mapping every valid Sudoku grid to another valid grid:
+    optional transposition, then permutations of bands, stacks, rows within
+    bands and columns within stacks, then relabeling of digits. It is stored as
+    one cell permutation plus one digit table, so applying it is a single
+    lookup per cell.
+    """
+
+    def __init__(self, perm: Sequence[int], digit_map: Sequence[int]) -> None:
+        """
+        Cell `i` of a transformed board takes the digit `d` of cell `perm[i]`
+        of the original board, relabeled to `digit_map[d]`. `digit_map[0]` must
+        be 0 (empty cells stay empty).
+        """
+        self.__perm = tuple(perm)
+        self.__digit_map = bytes(digit_map)
+        self.__table = self.__digit_map + bytes(range(len(self.__digit_map), 256))
+
+    @classmethod
+    def from_parts(
+        cls,
+        transpose: bool = False,
+        bands: Sequence[int] = (0, 1, 2),
+        rows: Sequence[Sequence[int]] = ((0, 1, 2),) * 3,
+        stacks: Sequence[int] = (0, 1, 2),
+        cols: Sequence[Sequence[int]] = ((0, 1, 2),) * 3,
+        digits: Sequence[int] = range(1, 10),
+    ) -> "Transform":
+        """
+        Build a transform from its parts. Row `3*i + j` of the result is row
+        `rows[i][j]` of band `bands[i]` of the (transposed) original, and
+        likewise for columns; digit `d` becomes `digits[d - 1]`.
+        """
+        row_map = [bands[i]*3 + rows[i][j] for i in range(3) for j in range(3)]
+        col_map = [stacks[i]*3 + cols[i][j] for i in range(3) for j in range(3)]
+        if transpose:
+            perm = [col_map[col]*9 + row_map[row] for row in range(9) for col in range(9)]
+        else:
+            perm = [row_map[row]*9 + col_map[col] for row in range(9) for col in range(9)]
+        return cls(perm, [0, *digits])
+
+    @classmethod
+    def from_index(cls, index: int) -> "Transform":
+        """
+        Get the `index`-th of the `COUNT` distinct transforms.
+        """
+        if not 0 <= index < COUNT:
+            raise IndexError(f"transform index out of range: {index}")
+        index, digit_index = divmod(index, math.factorial(9))
+        choices = []
+        for _ in range(8):
+            index, choice = divmod(index, 6)
+            choices.append(PERMUTATIONS_3[choice])
+        bands, stacks, *orders = choices
+
+        # Decode the digit relabeling from the factorial number system.
+        pool, digits = list(range(1, 10)), []
+        for place in range(8, -1, -1):
+            position, digit_index = divmod(digit_index, math.factorial(place))
+            digits.append(pool.pop(position))
+
+        return cls.from_parts(bool(index), bands, orders[:3], stacks, orders[3:], digits)
+
+    @classmethod
+    def random(cls, rng: Optional[random.Random] = None) -> "Transform":
+        """
+        Pick one of the `COUNT` transforms uniformly at random.
+        """
+        return cls.from_index((rng or random).randrange(COUNT))
+
+    def apply(self, board: Board) -> Board:
+        """
+        Transform a board. Clue cells move along with their digits.
+        """
+        cells = board.cells
+        new_cells = bytes([cells[source] for source in self.__perm]).translate(self.__table)
+        clues = board.clues
+        new_clues = sum(1 << i for i, source in enumerate(self.__perm) if clues >> source & 1)
+        return Board(new_cells, new_clues)
+
+    @property
+    def perm(self) -> tuple[int, ...]:
+        """
+        Source cell of each cell of a transformed board.
+        """
+        return self.__perm
+
+    @property
+    def digit_map(self) -> bytes:
+        """
+        New label of each digit, with 0 (empty) mapped to itself.
+        """
+        return self.__digit_map
+
+
+def apply_batch(
+    boards: "np.ndarray",
+    transforms: Union[Transform, Sequence[Transform]],
+) -> "np.ndarray":
+    """
+    Transform a batch of boards at once, given as an (N, 81) or (N, 9, 9)
+    array of digits. Either one transform is applied to every board, or the
+    `i`-th of N transforms is applied to the `i`-th board. Requires NumPy.
+    """
+    np = require_numpy("apply_batch()")
+    flat = np.asarray(boards).reshape(len(boards), 81)
+    if isinstance(transforms, Transform):
+        perm = np.array(transforms.perm, dtype=np.intp)
+        digit_map = np.frombuffer(transforms.digit_map, dtype=np.uint8)
+        return digit_map[flat[:, perm]].reshape(np.shape(boards))
+
+    perms = np.array([transform.perm for transform in transforms], dtype=np.intp)
+    digit_maps = np.array([list(transform.digit_map) for transform in transforms], dtype=np.uint8)
+    moved = np.take_along_axis(flat, perms, axis=1)
+    relabeled = np.take_along_axis(digit_maps, moved.astype(np.intp), axis=1)
+    return relabeled.reshape(np.shape(boards))
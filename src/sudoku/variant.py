@@ -0,0 +1,477 @@
+import functools
+import random
+from array import array
+from collections.abc import Sequence
+from typing import Optional
+
+from .board import CellPos
+from .layout import Layout
+
+
+# Digits as written in puzzle text, so that every digit up to 25 is one
+# character: 1 to 9, then A (10) to P (25). Empty cells are "." or "0".
+DIGIT_CHARS = "123456789ABCDEFGHIJKLMNOP"
+DIGIT_OF_CHAR = {char: digit for digit, char in enumerate(DIGIT_CHARS, start=1)}
+
+
+class VariantSudoku:
+    """
+    Sudoku puzzle on any layout (see `Layout`): grids from 4x4 to 25x25, with
+    boxes or irregular Jigsaw regions, and optionally Killer cages. Like
+    `Sudoku`, it keeps the count of each digit in each unit and cage up to
+    date on every edit, so validity, conflict and win checks take constant
+    time whatever the size of the grid. Candidates and pencil marks are masks
+    with bit `digit - 1` set for each digit.
+
+    The classic 9x9 game keeps using `Sudoku`, whose tables are module
+    constants and whose board is the compact 81-byte `Board`.
+    """
+
+    def __init__(
+        self,
+        layout: Layout,
+        cells: Optional[Sequence[int]] = None,
+        clues: Optional[int] = None,
+    ) -> None:
+        """
+        Create a puzzle from N*N digits (0 for an empty cell) in row-major
+        order, or an empty grid if not given, as with most Killer puzzles. If
+        `clues` is not given, every filled cell is a clue.
+        """
+        cell_count = layout.cell_count
+        cells = bytearray(cells if cells is not None else cell_count)
+        if len(cells) != cell_count:
+            raise ValueError(f"the grid has {cell_count} cells, got {len(cells)}")
+        if max(cells) > layout.size:
+            raise ValueError(f"digits of a {layout.size}x{layout.size} grid go up to {layout.size}")
+        if clues is None:
+            clues = sum(1 << index for index, digit in enumerate(cells) if digit)
+
+        self.__layout = layout
+        self.__cells = bytearray(cell_count)
+        self.__clues = 0
+
+        # The units and the cage containing each cell, as indices into the
+        # counts below: the 3N units come first, then the cages.
+        unit_count = len(layout.units)
+        self.__groups = tuple(
+            units if (cage := layout.cage_of[index]) < 0 else (*units, unit_count + cage)
+            for index, units in enumerate(layout.cell_units)
+        )
+
+        # How many times each digit appears in each unit and cage, indexed as
+        # `counts[group][digit]`, the mask of the digits appearing in each, and
+        # how many digits appear exactly once in each. Along with the sum of
+        # the digits in each cage, the number of filled cells and of conflicts
+        # (extra occurrences of digits, and cages whose digits cannot add up to
+        # their sum), they are kept up to date by `set()`.
+        group_count = unit_count + len(layout.cages)
+        self.__counts = [[0] * (layout.size + 1) for _ in range(group_count)]
+        self.__masks = [0] * group_count
+        self.__singles = [0] * group_count
+        self.__cage_sums = [0] * len(layout.cages)
+        self.__cage_filled = [0] * len(layout.cages)
+        self.__filled = 0
+        self.__conflicts = 0
+        self.__version = 0
+
+        # Pencil marks of each cell in row-major order.
+        self.__notes = array("I", bytes(4 * cell_count))
+
+        for index, digit in enumerate(cells):
+            if digit:
+                self.set(divmod(index, layout.size), digit)
+        self.__clues = clues
+        self.__version = 0
+
+    @classmethod
+    def from_string(cls, layout: Layout, text: str) -> "VariantSudoku":
+        """
+        Parse a puzzle from N*N characters (see `DIGIT_CHARS`), on one line or
+        on N lines. Every given digit is a clue.
+        """
+        chars = "".join(text.split())
+        if len(chars) != layout.cell_count:
+            raise ValueError(f"the grid has {layout.cell_count} cells, got {len(chars)}")
+        try:
+            cells = [0 if char in ".0" else DIGIT_OF_CHAR[char.upper()] for char in chars]
+        except KeyError as error:
+            raise ValueError(f"not a digit: {error.args[0]!r}") from None
+        return cls(layout, cells)
+
+    def get(self, pos: CellPos) -> Optional[int]:
+        """
+        Get the digit inside a cell.
+        """
+        row, col = pos
+        return self.__cells[row*self.__layout.size + col] or None
+
+    def set(self, pos: CellPos, digit: Optional[int]) -> None:
+        """
+        Set the digit inside a cell. This has no effect if the cell is a clue.
+        """
+        row, col = pos
+        index = row*self.__layout.size + col
+        old_digit = self.__cells[index]
+        new_digit = digit or 0
+        if self.__clues >> index & 1 or old_digit == new_digit:
+            return
+        if old_digit:
+            self.__count(index, old_digit, -1)
+        self.__cells[index] = new_digit
+        if new_digit:
+            self.__count(index, new_digit, 1)
+        self.__version += 1
+
+    def get_notes(self, pos: CellPos) -> int:
+        """
+        Get the pencil marks of a cell, as a mask with bit `digit - 1` set for
+        each noted digit.
+        """
+        row, col = pos
+        return self.__notes[row*self.__layout.size + col]
+
+    def set_notes(self, pos: CellPos, notes: int) -> None:
+        """
+        Set the pencil marks of a cell. This has no effect if the cell is a clue.
+        """
+        row, col = pos
+        index = row*self.__layout.size + col
+        if not self.__clues >> index & 1:
+            self.__notes[index] = notes
+
+    def eliminate_note(self, pos: CellPos, digit: int) -> list[int]:
+        """
+        Remove a digit from the pencil marks of the cells sharing a unit or a
+        cage with the cell, e.g. after placing it there. Returns the indices
+        (`row*N + col`) of the cells whose marks changed.
+        """
+        row, col = pos
+        bit = 1 << (digit - 1)
+        notes = self.__notes
+        peers = self.__layout.peers[row*self.__layout.size + col]
+        changed = [peer for peer in peers if notes[peer] & bit]
+        for peer in changed:
+            notes[peer] &= ~bit
+        return changed
+
+    def get_candidates(self, pos: CellPos) -> int:
+        """
+        Get the digits which an empty cell may hold given the digits filled in
+        so far, as a mask with bit `digit - 1` set for each. In a cage, only
+        digits which can still make up the cage's sum are candidates. A filled
+        cell has no candidates.
+        """
+        layout = self.__layout
+        row, col = pos
+        index = row*layout.size + col
+        if self.__cells[index]:
+            return 0
+        taken = 0
+        for group in self.__groups[index]:
+            taken |= self.__masks[group]
+        candidates = layout.all_digits & ~taken
+        if (cage := layout.cage_of[index]) >= 0:
+            cells, total = layout.cages[cage]
+            candidates &= _sum_candidates(
+                len(cells) - self.__cage_filled[cage],
+                total - self.__cage_sums[cage],
+                layout.all_digits & ~self.__masks[len(layout.units) + cage],
+            )
+        return candidates
+
+    def is_clue(self, pos: CellPos) -> bool:
+        """
+        Whether the cell is a clue.
+        """
+        row, col = pos
+        return bool(self.__clues >> (row*self.__layout.size + col) & 1)
+
+    def is_same_group(self, pos1: CellPos, pos2: CellPos) -> bool:
+        """
+        Whether two cells belong to the same row, column, region or cage.
+        """
+        layout = self.__layout
+        (row1, col1), (row2, col2) = pos1, pos2
+        index1, index2 = row1*layout.size + col1, row2*layout.size + col2
+        if row1 == row2 or col1 == col2 or layout.region_of[index1] == layout.region_of[index2]:
+            return True
+        return layout.cage_of[index1] >= 0 and layout.cage_of[index1] == layout.cage_of[index2]
+
+    def has_valid_digit(self, pos: CellPos) -> bool:
+        """
+        Whether the cell contains a digit not seen in other cells of the same
+        row, column, region or cage, and, in a cage, whether the cage's digits
+        can still add up to its sum. An empty cell is considered valid.
+        """
+        row, col = pos
+        index = row*self.__layout.size + col
+        if not (digit := self.__cells[index]):
+            return True
+        if not all(self.__counts[group][digit] == 1 for group in self.__groups[index]):
+            return False
+        cage = self.__layout.cage_of[index]
+        return cage < 0 or not self.__is_cage_broken(cage)
+
+    def is_unit_complete(self, unit: int) -> bool:
+        """
+        Whether a unit (an index into `layout.units`) holds all N digits
+        exactly once.
+        """
+        return self.__singles[unit] == self.__layout.size
+
+    def is_solved(self) -> bool:
+        """
+        Whether the puzzle has been solved.
+        """
+        return self.__filled == self.__layout.cell_count and self.__conflicts == 0
+
+    def solve(self, max_solutions: int = 2) -> list[bytes]:
+        """
+        Find up to `max_solutions` solutions of the digits currently filled in
+        (see `solve_variant()`).
+        """
+        return solve_variant(self.__layout, self.__cells, max_solutions)
+
+    def reset(self) -> None:
+        """
+        Reset the puzzle, clearing its pencil marks too.
+        """
+        size = self.__layout.size
+        for index in range(self.__layout.cell_count):
+            self.set(divmod(index, size), None)
+        self.__notes = array("I", bytes(4 * self.__layout.cell_count))
+
+    def __count(self, index: int, digit: int, delta: int) -> None:
+        """
+        Add `delta` to the counts of a digit in the units and cage containing
+        the cell.
+        """
+        self.__filled += delta
+        for group in self.__groups[index]:
+            counts = self.__counts[group]
+            old_count, new_count = counts[digit], counts[digit] + delta
+            counts[digit] = new_count
+            if not old_count or not new_count:
+                self.__masks[group] ^= 1 << (digit - 1)
+            self.__singles[group] += (new_count == 1) - (old_count == 1)
+            self.__conflicts += max(new_count - 1, 0) - max(old_count - 1, 0)
+
+        if (cage := self.__layout.cage_of[index]) >= 0:
+            was_broken = self.__is_cage_broken(cage)
+            self.__cage_sums[cage] += delta * digit
+            self.__cage_filled[cage] += delta
+            self.__conflicts += self.__is_cage_broken(cage) - was_broken
+
+    def __is_cage_broken(self, cage: int) -> bool:
+        """
+        Whether the digits in a cage add up to more than its sum, or fill it
+        and add up to less.
+        """
+        cells, total = self.__layout.cages[cage]
+        cage_sum = self.__cage_sums[cage]
+        return cage_sum > total or (self.__cage_filled[cage] == len(cells) and cage_sum != total)
+
+    @property
+    def layout(self) -> Layout:
+        """
+        The constraint tables of the puzzle's variant.
+        """
+        return self.__layout
+
+    @property
+    def version(self) -> int:
+        """
+        Number of times a digit has been changed. Compare it before and after
+        handling an input to tell whether the puzzle was edited.
+        """
+        return self.__version
+
+    def __str__(self) -> str:
+        return "".join(DIGIT_CHARS[digit - 1] if digit else "." for digit in self.__cells)
+
+
+def solve_variant(
+    layout: Layout,
+    cells: Sequence[int],
+    max_solutions: int = 2,
+    rng: Optional[random.Random] = None,
+) -> list[bytes]:
+    """
+    Find up to `max_solutions` solutions of N*N digits (0 for an empty cell)
+    on a layout. Works like the classic bitmask solver: fill in naked and
+    hidden singles, then branch on the cell with the fewest candidates, with
+    cage sums narrowing the candidates of caged cells. Candidates are tried in
+    random order if `rng` is given, which is how random solution grids are made.
+    """
+    cells = list(cells)
+    if len(cells) != layout.cell_count:
+        raise ValueError(f"the grid has {layout.cell_count} cells, got {len(cells)}")
+    state = _State(
+        cells,
+        [0] * len(layout.units),
+        [0] * len(layout.cages),
+        [total for _, total in layout.cages],
+        [len(cage_cells) for cage_cells, _ in layout.cages],
+    )
+    for index, digit in enumerate(cells):
+        if not digit:
+            continue
+        bit = 1 << (digit - 1)
+        cage = layout.cage_of[index]
+        placed = state.placed
+        a, b, c = layout.cell_units[index]
+        if (placed[a] | placed[b] | placed[c] | (state.cage_used[cage] if cage >= 0 else 0)) & bit:
+            return []   # The given digits already conflict.
+        state.place(layout, index, bit)
+    for left, empty in zip(state.cage_left, state.cage_empty):
+        if left < 0 or (left and not empty):
+            return []   # A cage's given digits already miss its sum.
+
+    solutions: list[list[int]] = []
+    _search(layout, state, solutions, max_solutions, rng)
+    return [bytes(solution) for solution in solutions]
+
+
+class _State:
+    """
+    A partial solution: the digits, the masks of digits placed in each unit
+    and cage, and the sum left to make and the empty cells left in each cage.
+    """
+
+    __slots__ = ("cells", "placed", "cage_used", "cage_left", "cage_empty")
+
+    def __init__(
+        self,
+        cells: list[int],
+        placed: list[int],
+        cage_used: list[int],
+        cage_left: list[int],
+        cage_empty: list[int],
+    ) -> None:
+        self.cells = cells
+        self.placed = placed
+        self.cage_used = cage_used
+        self.cage_left = cage_left
+        self.cage_empty = cage_empty
+
+    def copy(self) -> "_State":
+        return _State(
+            self.cells[:], self.placed[:], self.cage_used[:], self.cage_left[:], self.cage_empty[:]
+        )
+
+    def candidates(self, layout: Layout, index: int) -> int:
+        """
+        Get the candidates of an empty cell.
+        """
+        placed = self.placed
+        a, b, c = layout.cell_units[index]
+        candidates = layout.all_digits & ~(placed[a] | placed[b] | placed[c])
+        if (cage := layout.cage_of[index]) >= 0:
+            available = layout.all_digits & ~self.cage_used[cage]
+            candidates &= _sum_candidates(self.cage_empty[cage], self.cage_left[cage], available)
+        return candidates
+
+    def place(self, layout: Layout, index: int, bit: int) -> None:
+        """
+        Put the digit of a single-bit mask in a cell.
+        """
+        self.cells[index] = bit.bit_length()
+        for unit in layout.cell_units[index]:
+            self.placed[unit] |= bit
+        if (cage := layout.cage_of[index]) >= 0:
+            self.cage_used[cage] |= bit
+            self.cage_left[cage] -= bit.bit_length()
+            self.cage_empty[cage] -= 1
+
+
+def _search(
+    layout: Layout,
+    state: _State,
+    solutions: list[list[int]],
+    limit: int,
+    rng: Optional[random.Random],
+) -> None:
+    """
+    Fill in naked and hidden singles until stuck, then branch on the empty cell
+    with the fewest candidates. `state` is modified in place.
+    """
+    cells, placed, all_digits = state.cells, state.placed, layout.all_digits
+    while True:
+        progress = False
+        best, best_count, best_cands = -1, layout.size + 1, 0
+
+        # Naked singles: cells with only one candidate left.
+        for index in range(layout.cell_count):
+            if cells[index]:
+                continue
+            cands = state.candidates(layout, index)
+            if not cands:
+                return
+            if not cands & (cands - 1):
+                state.place(layout, index, cands)
+                progress = True
+            elif (count := cands.bit_count()) < best_count:
+                best, best_count, best_cands = index, count, cands
+        if progress:
+            continue
+
+        if best < 0:
+            solutions.append(cells)
+            return
+
+        # Hidden singles: digits with only one possible cell left in a unit.
+        for unit_index, unit in enumerate(layout.units):
+            once = twice = 0
+            for index in unit:
+                if not cells[index]:
+                    cands = state.candidates(layout, index)
+                    twice |= once & cands
+                    once |= cands
+            if (once | placed[unit_index]) != all_digits:
+                return  # Some digit has nowhere to go in this unit.
+            hidden = once & ~twice
+            while hidden:
+                bit = hidden & -hidden
+                hidden ^= bit
+                for index in unit:
+                    if not cells[index] and state.candidates(layout, index) & bit:
+                        state.place(layout, index, bit)
+                        progress = True
+                        break
+        if not progress:
+            break
+
+    bits = [1 << i for i in range(layout.size) if best_cands >> i & 1]
+    if rng is not None:
+        rng.shuffle(bits)
+    for bit in bits:
+        new_state = state.copy()
+        new_state.place(layout, best, bit)
+        _search(layout, new_state, solutions, limit, rng)
+        if len(solutions) >= limit:
+            return
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _sum_candidates(count: int, total: int, available: int) -> int:
+    """
+    Get the mask of the digits in `available` which are part of some set of
+    `count` distinct available digits adding up to `total`.
+    """
+    if count <= 0 or total <= 0:
+        return 0
+    if count == 1:
+        return available & (1 << (total - 1)) if total <= available.bit_length() else 0
+    result = 0
+    rest = available
+    while rest:
+        # Take the smallest digit left; the other digits are larger.
+        bit = rest & -rest
+        rest ^= bit
+        digit = bit.bit_length()
+        if digit * count > total:
+            break
+        if others := _sum_candidates(count - 1, total - digit, rest):
+            result |= bit | others
+    return result
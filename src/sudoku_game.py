@@ -1,20 +1,64 @@
+import os
 import sys
-from typing import NoReturn
+from typing import NoReturn, Optional
 
 import pygame
+from pygame.locals import NOEVENT
 
 from .screen import Screen
+from .sudoku import PuzzlePool, SessionFile
+from .utils import ProfilerOverlay, mouse, profiler
+
+
+SESSION_FILE = "data/session.bin"
 
 
 class SudokuGame:
     """
     A simple Sudoku game with graphical interface.
     """
-    def __init__(self) -> None:
-        pygame.init()
+    def __init__(
+        self,
+        headless: bool = False,
+        fps: int = 60,
+        pool_size: int = 3,
+        profile_path: Optional[str] = None,
+        session_path: Optional[str] = SESSION_FILE,
+    ) -> None:
+        """
+        Create the game window, or render to memory only if `headless`. The game
+        loop runs at `fps` frames per second at most, or as fast as possible if
+        0. `pool_size` puzzles per difficulty are generated in the background,
+        once the difficulty selection screen is first shown. If `profile_path`
+        is given, frame timings are recorded and written to it when the game
+        quits. The game in progress is saved to `session_path`, unless it is
+        `None`.
+        """
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+        # Only what the game uses, not audio, joysticks and the like.
+        pygame.display.init()
+        pygame.font.init()
         pygame.display.set_caption(title="Sudoku Game")
 
         self.__surface = pygame.display.set_mode(size=(1200, 900))
+        self.__fps = fps
+
+        self.__profile_path = profile_path
+        profiler.enabled = profile_path is not None
+        self.__overlay: Optional[ProfilerOverlay] = None
+
+        # The event the game loop woke up for, handled before the queued ones.
+        self.__woken_by: Optional[pygame.event.Event] = None
+
+        # Started once a puzzle may be needed (see `SelectScreen`), so it does
+        # not slow down the start.
+        self.__puzzle_pool = PuzzlePool(size=pool_size)
+
+        self.__session_file = None if session_path is None else SessionFile(session_path)
+        if self.__session_file is not None:
+            self.__session_file.start()
 
     def start(self) -> NoReturn:
         """
@@ -25,14 +69,93 @@ def start(self) -> NoReturn:
         self.__screen = TitleScreen(game=self)
         clock = pygame.time.Clock()
         while True:
-            clock.tick(60)
-            self.__screen.handle_events()
+            clock.tick(self.__fps)
+            self.run_frame()
+            self.__wait_for_event()
+
+    def run_frame(self) -> None:
+        """
+        Handle user inputs and display the current screen, once.
+        """
+        mouse.sample()
+        with profiler.phase("frame"):
+            with profiler.phase("events"):
+                self.__screen.update_hover()
+                self.__screen.handle_events()
             self.__screen.display()
 
+        if self.__overlay is not None:
+            old_size = self.__overlay.rect.size
+            self.__overlay.update()
+            if self.__overlay.rect.size != old_size:
+                self.__screen.invalidate()  # Uncover what a larger panel hid.
+            self.__surface.blit(self.__overlay.image, self.__overlay.rect)
+            pygame.display.update(self.__overlay.rect)
+
+    def __wait_for_event(self) -> None:
+        """
+        Sleep until there is an event to handle or the screen changes by itself,
+        rather than running idle frames. The event waited for is kept for the
+        screen to handle first (see `get_events()`), since putting it back in
+        the queue would put it behind the events that came after it.
+        """
+        if self.__woken_by is not None or pygame.event.peek():
+            return
+
+        timeout = self.__screen.get_time_to_next_change()
+        if self.__overlay is not None:
+            overlay_timeout = self.__overlay.get_time_to_refresh()
+            timeout = overlay_timeout if timeout is None else min(timeout, overlay_timeout)
+
+        if timeout is None:
+            event = pygame.event.wait()
+        elif timeout > 0:
+            event = pygame.event.wait(timeout)
+        else:
+            return
+        if event.type != NOEVENT:
+            self.__woken_by = event
+
+    def get_events(self) -> list[pygame.event.Event]:
+        """
+        Get the events for the screen to handle this frame, in the order they
+        came in, and remove them from the queue.
+        """
+        events = pygame.event.get()
+        if self.__woken_by is not None:
+            events.insert(0, self.__woken_by)
+            self.__woken_by = None
+        return events
+
+    def toggle_profiler_overlay(self) -> None:
+        """
+        Show or hide the frame time overlay. Frames are timed while it is shown,
+        even if the game was not started with profiling.
+        """
+        if self.__overlay is None:
+            self.__overlay = ProfilerOverlay(topleft=(10, 10))
+            profiler.enabled = True
+        else:
+            self.__overlay = None
+            profiler.enabled = self.__profile_path is not None
+            self.__screen.invalidate()
+
+    def save_profile(self) -> None:
+        """
+        Write the frame timings to the profile file, if profiling.
+        """
+        if self.__profile_path is not None:
+            profiler.dump(self.__profile_path)
+
     def quit(self) -> NoReturn:
         """
         Close the game. This terminates the process with exit code 0.
         """
+        self.__screen.on_quit()
+        if self.__session_file is not None:
+            self.__session_file.stop()
+        self.__puzzle_pool.stop()
+        self.save_profile()
         sys.exit(0)
 
     @property
@@ -43,6 +166,20 @@ def surface(self) -> pygame.Surface:
         """
         return self.__surface
 
+    @property
+    def puzzle_pool(self) -> PuzzlePool:
+        """
+        Puzzles generated in the background for new games.
+        """
+        return self.__puzzle_pool
+
+    @property
+    def session_file(self) -> Optional[SessionFile]:
+        """
+        Where the game in progress is saved, if anywhere.
+        """
+        return self.__session_file
+
     @property
     def screen(self) -> Screen:
         """
@@ -54,3 +191,4 @@ def screen(self) -> Screen:
     @screen.setter
     def screen(self, new_screen: Screen) -> None:
         self.__screen = new_screen
+        new_screen.update_hover()
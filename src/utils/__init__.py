@@ -1,2 +1,9 @@
 from .button import Button
+from .font_registry import FontRegistry, font_registry
+from .game_clock import GameClock, game_clock
+from .glyph_cache import GlyphCache, glyph_cache
+from .hit_index import HitIndex
+from .mouse import Mouse, mouse
+from .profiler import FrameProfiler, profiler
+from .profiler_overlay import ProfilerOverlay
 from .timer import Timer
@@ -1,10 +1,15 @@
 import pygame
 from pygame.locals import QUIT
 
+from .glyph_cache import glyph_cache
+from .hit_index import HitIndex
+from .mouse import mouse
+
 
 class Button(pygame.sprite.Sprite):
     """
     Rectangular button that inverts colors when the mouse is hovering over it.
+    Whether it is hovered is kept up to date by the `HitIndex` of the screen.
     """
 
     def __init__(
@@ -22,12 +27,29 @@ def __init__(
         self.rect = self.image.get_rect(**kwargs)
 
         self.text = text
-        self.font = pygame.font.SysFont("Futura", size=30)
         self.bg_color = bg_color
         self.fg_color = fg_color
 
+        # The label is rendered in foreground color, or in background color
+        # when hovered.
+        glyph_cache.preload([text], colors=[bg_color, fg_color])
+
+        # Whether the mouse is over the button, as set by a `HitIndex`.
+        self.hovered = False
+
+        # Whether the image changed since the button was last drawn. It is only
+        # repainted when the mouse enters or leaves it.
+        self.dirty = True
+        self.__painted_hovered = None
+
     def update(self) -> None:
-        if self.is_hovered():
+        hovered = self.hovered
+        if hovered == self.__painted_hovered:
+            return
+        self.__painted_hovered = hovered
+        self.dirty = True
+
+        if hovered:
             self.image.fill(self.fg_color)
             text_color = self.bg_color
         else:
@@ -36,7 +58,7 @@ def update(self) -> None:
                              ((0, 0), self.rect.size), width=3)
             text_color = self.fg_color
 
-        text = self.font.render(self.text, True, text_color)
+        text = glyph_cache.render(self.text, color=text_color)
         text_rect = text.get_rect(center=self.image.get_rect().center)
         self.image.blit(text, text_rect)
 
@@ -44,7 +66,7 @@ def is_hovered(self) -> bool:
         """
         Whether the mouse is hovering over the button.
         """
-        return self.rect.collidepoint(pygame.mouse.get_pos())
+        return self.hovered
 
 
 def main() -> None:
@@ -58,10 +80,13 @@ def main() -> None:
 
     button = Button("BUTTON", size=(250, 100), center=screen.get_rect().center)
     all_sprites = pygame.sprite.RenderPlain(button)
+    hit_index = HitIndex(button)
 
     while True:
         clock.tick(60)
 
+        mouse.sample()
+        hit_index.update(mouse.get_pos())
         screen.fill("white")
         all_sprites.update()
         all_sprites.draw(screen)
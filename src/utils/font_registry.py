@@ -0,0 +1,60 @@
+import os
+from typing import Optional
+
+import pygame
+
+
+FONT_DIR = "data/fonts"
+FONT_EXTENSIONS = (".ttf", ".otf")
+
+
+class FontRegistry:
+    """
+    Process-wide registry of fonts. Each font name is resolved to a font file
+    only once, and each (name, size) pair is loaded only once.
+
+    Names are looked up as font files in "data/fonts" (e.g. "Futura.ttf").
+    Installed system fonts are only searched if `scan_system_fonts` is set,
+    since scanning them can take long on a cold start; otherwise fonts not
+    found are replaced by the font bundled with pygame.
+    """
+
+    def __init__(self, scan_system_fonts: bool = False) -> None:
+        self.scan_system_fonts = scan_system_fonts
+        self.__paths: dict[str, Optional[str]] = {}
+        self.__fonts: dict[tuple[str, int], pygame.font.Font] = {}
+
+    def get(self, name: str = "Futura", size: int = 30) -> pygame.font.Font:
+        """
+        Get the font of given name and size. Falls back to pygame's default font
+        if no such font is found.
+        """
+        if (font := self.__fonts.get((name, size))) is None:
+            font = pygame.font.Font(self.resolve(name), size)
+            self.__fonts[(name, size)] = font
+        return font
+
+    def resolve(self, name: str) -> Optional[str]:
+        """
+        Get the path of the font file for a font name, or `None` if no such
+        font is found.
+        """
+        if name not in self.__paths:
+            self.__paths[name] = self.__find(name)
+        return self.__paths[name]
+
+    def __find(self, name: str) -> Optional[str]:
+        """
+        Look for the font file of a font name.
+        """
+        for extension in FONT_EXTENSIONS:
+            path = os.path.join(FONT_DIR, name + extension)
+            if os.path.isfile(path):
+                return path
+        if self.scan_system_fonts:
+            return pygame.font.match_font(name)
+        return None
+
+
+# The registry shared by all sprites and screens.
+font_registry = FontRegistry()
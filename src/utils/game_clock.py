@@ -0,0 +1,41 @@
+import time
+from typing import Optional
+
+
+class GameClock:
+    """
+    Source of the time for every sprite. It follows the real time, unless
+    switched to virtual time, which only moves when advanced explicitly (e.g.
+    by one frame at a time when replaying recorded inputs). Unlike pygame's
+    clock, the real time does not need pygame's timer to be initialized.
+    """
+
+    def __init__(self) -> None:
+        self.__origin = time.monotonic()
+        self.__virtual_ticks: Optional[int] = None
+
+    def get_ticks(self) -> int:
+        """
+        Get the number of milliseconds since the game started.
+        """
+        if self.__virtual_ticks is not None:
+            return self.__virtual_ticks
+        return int((time.monotonic() - self.__origin) * 1000)
+
+    def use_virtual_time(self, ticks: int = 0) -> None:
+        """
+        Freeze the time at `ticks` milliseconds, until advanced.
+        """
+        self.__virtual_ticks = ticks
+
+    def advance(self, milliseconds: int) -> None:
+        """
+        Move the virtual time forward.
+        """
+        if self.__virtual_ticks is None:
+            raise RuntimeError("only virtual time can be advanced")
+        self.__virtual_ticks += milliseconds
+
+
+# The clock shared by all sprites.
+game_clock = GameClock()
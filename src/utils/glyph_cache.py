@@ -0,0 +1,77 @@
+from collections import OrderedDict
+from collections.abc import Iterable
+
+import pygame
+
+from .font_registry import font_registry
+
+
+GlyphKey = tuple[str, str, int, str]     # (text, font name, size, color)
+
+
+class GlyphCache:
+    """
+    Cache of rendered text surfaces. Preloaded glyphs stay in the cache for
+    good, while any other text is kept in a least-recently-used cache of limited
+    capacity.
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        self.__capacity = capacity
+        self.__preloaded: dict[GlyphKey, pygame.Surface] = {}
+        self.__recent: OrderedDict[GlyphKey, pygame.Surface] = OrderedDict()
+
+    def preload(
+        self,
+        texts: Iterable[str],
+        font_name: str = "Futura",
+        size: int = 30,
+        colors: Iterable[str] = ("black",),
+    ) -> None:
+        """
+        Render every combination of texts and colors now, and never evict them.
+        """
+        colors = list(colors)
+        for text in texts:
+            for color in colors:
+                key = (text, font_name, size, color)
+                if key in self.__preloaded:
+                    continue
+                surface = self.__recent.pop(key, None)
+                self.__preloaded[key] = surface or self.__render(key)
+
+    def render(
+        self,
+        text: str,
+        font_name: str = "Futura",
+        size: int = 30,
+        color: str = "black",
+    ) -> pygame.Surface:
+        """
+        Get the rendered surface of a text. The returned surface is shared, so
+        callers should only blit it and never draw onto it.
+        """
+        key = (text, font_name, size, color)
+        if (surface := self.__preloaded.get(key)) is not None:
+            return surface
+
+        if (surface := self.__recent.get(key)) is not None:
+            self.__recent.move_to_end(key)
+            return surface
+
+        surface = self.__render(key)
+        self.__recent[key] = surface
+        if len(self.__recent) > self.__capacity:
+            self.__recent.popitem(last=False)
+        return surface
+
+    def __render(self, key: GlyphKey) -> pygame.Surface:
+        """
+        Render a text with antialiasing.
+        """
+        text, font_name, size, color = key
+        return font_registry.get(font_name, size).render(text, True, color)
+
+
+# The cache shared by all sprites.
+glyph_cache = GlyphCache()
@@ -0,0 +1,72 @@
+from collections import defaultdict
+from typing import Optional
+
+import pygame
+
+
+BUCKET_SIZE = 100   # Side of the square areas sprites are bucketed by, in pixels.
+
+
+class HitIndex:
+    """
+    Spatial index of the sprites on a screen which react to the mouse, such as
+    buttons. Sprites are bucketed by the square areas their rects overlap, so
+    finding the sprite at a point only tests the few sprites of one bucket,
+    however many sprites the screen has. Sprites are expected not to move once
+    added.
+
+    The index keeps track of the sprite under the mouse and sets the `hovered`
+    attribute of the sprite entering or leaving it, so sprites need not test
+    the mouse position themselves.
+    """
+
+    def __init__(self, *sprites: pygame.sprite.Sprite, bucket_size: int = BUCKET_SIZE) -> None:
+        self.__bucket_size = bucket_size
+        self.__buckets: defaultdict[tuple[int, int], list[pygame.sprite.Sprite]] = defaultdict(list)
+        self.__hovered: Optional[pygame.sprite.Sprite] = None
+        self.add(*sprites)
+
+    def add(self, *sprites: pygame.sprite.Sprite) -> None:
+        """
+        Add sprites to the index. Sprites added later are on top of those they
+        overlap.
+        """
+        size = self.__bucket_size
+        for sprite in sprites:
+            sprite.hovered = False
+            rect = sprite.rect
+            for x in range(rect.left // size, (rect.right - 1) // size + 1):
+                for y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                    self.__buckets[x, y].append(sprite)
+
+    def sprite_at(self, pos: tuple[int, int]) -> Optional[pygame.sprite.Sprite]:
+        """
+        Get the topmost sprite at a point, or `None` if there is none.
+        """
+        x, y = pos
+        bucket = self.__buckets.get((x // self.__bucket_size, y // self.__bucket_size), ())
+        for sprite in reversed(bucket):
+            if sprite.rect.collidepoint(pos):
+                return sprite
+        return None
+
+    def update(self, mouse_pos: tuple[int, int]) -> None:
+        """
+        Find the sprite under the mouse, and update the `hovered` attribute of
+        the sprites if it changed.
+        """
+        sprite = self.sprite_at(mouse_pos)
+        if sprite is self.__hovered:
+            return
+        if self.__hovered is not None:
+            self.__hovered.hovered = False
+        if sprite is not None:
+            sprite.hovered = True
+        self.__hovered = sprite
+
+    @property
+    def hovered(self) -> Optional[pygame.sprite.Sprite]:
+        """
+        The sprite under the mouse as of the last update, if any.
+        """
+        return self.__hovered
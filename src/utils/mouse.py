@@ -0,0 +1,43 @@
+from typing import Optional
+
+import pygame
+
+
+class Mouse:
+    """
+    Source of the mouse position for every sprite and screen. The position is
+    sampled once per frame, so however many sprites ask for it, pygame is only
+    asked once. It follows the real mouse, unless a virtual position is set
+    (e.g. when replaying recorded inputs without a window).
+    """
+
+    def __init__(self) -> None:
+        self.__virtual_pos: Optional[tuple[int, int]] = None
+        self.__sampled_pos: Optional[tuple[int, int]] = None
+
+    def sample(self) -> None:
+        """
+        Read the position of the real mouse, which `get_pos()` then returns
+        until the next sample. The game loop does this at the start of a frame.
+        """
+        self.__sampled_pos = pygame.mouse.get_pos()
+
+    def get_pos(self) -> tuple[int, int]:
+        """
+        Get the mouse position on the display surface.
+        """
+        if self.__virtual_pos is not None:
+            return self.__virtual_pos
+        if self.__sampled_pos is None:
+            self.sample()
+        return self.__sampled_pos
+
+    def move_to(self, pos: Optional[tuple[int, int]]) -> None:
+        """
+        Set the virtual mouse position, or follow the real mouse again if `None`.
+        """
+        self.__virtual_pos = pos
+
+
+# The mouse shared by all sprites and screens.
+mouse = Mouse()
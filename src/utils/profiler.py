@@ -0,0 +1,122 @@
+import csv
+import json
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import ContextManager
+
+import pygame
+
+
+class _Timing:
+    """
+    Context manager recording how long its body takes.
+    """
+
+    __slots__ = ("__profiler", "__name", "__start")
+
+    def __init__(self, profiler: "FrameProfiler", name: str) -> None:
+        self.__profiler = profiler
+        self.__name = name
+
+    def __enter__(self) -> None:
+        self.__start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.__profiler.record(self.__name, time.perf_counter() - self.__start)
+
+
+class FrameProfiler:
+    """
+    Rolling timings of the phases of each frame ("events", "update", "draw",
+    "flip" and the whole "frame") and of each kind of sprite's update. While
+    disabled, timing a phase costs about as much as an empty `with` block.
+    """
+
+    def __init__(self, window: int = 600) -> None:
+        """
+        Keep the last `window` samples of each phase.
+        """
+        self.enabled = False
+        self.__window = window
+        self.__samples: dict[str, deque[float]] = {}
+
+    def phase(self, name: str) -> ContextManager[None]:
+        """
+        Time the body of a `with` block as a phase.
+        """
+        return _Timing(self, name) if self.enabled else _UNTIMED
+
+    def update_sprites(self, sprites: pygame.sprite.AbstractGroup) -> None:
+        """
+        Update a group of sprites, timing the whole "update" phase and each
+        sprite's update, keyed by its class name.
+        """
+        if not self.enabled:
+            sprites.update()
+            return
+
+        start = time.perf_counter()
+        for sprite in sprites:
+            sprite_start = time.perf_counter()
+            sprite.update()
+            self.record(f"update:{type(sprite).__name__}", time.perf_counter() - sprite_start)
+        self.record("update", time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Add a sample to a phase.
+        """
+        if (samples := self.__samples.get(name)) is None:
+            samples = self.__samples[name] = deque(maxlen=self.__window)
+        samples.append(seconds)
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """
+        Get the sample count, and the mean, p50, p95, p99 and maximum in
+        milliseconds of every phase.
+        """
+        stats = {}
+        for name, samples in self.__samples.items():
+            ordered = sorted(samples)
+            stats[name] = {
+                "count": len(ordered),
+                "mean_ms": sum(ordered) / len(ordered) * 1000,
+                "p50_ms": _percentile(ordered, 50) * 1000,
+                "p95_ms": _percentile(ordered, 95) * 1000,
+                "p99_ms": _percentile(ordered, 99) * 1000,
+                "max_ms": ordered[-1] * 1000,
+            }
+        return stats
+
+    def dump(self, filename: str) -> None:
+        """
+        Write the stats and the recent samples to a JSON file, or only the stats
+        to a CSV file if the filename ends with ".csv".
+        """
+        stats = self.stats()
+        with open(filename, mode="w", newline="") as fp:
+            if filename.endswith(".csv"):
+                writer = csv.writer(fp)
+                writer.writerow(["phase", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"])
+                for name, phase_stats in stats.items():
+                    writer.writerow([name, *phase_stats.values()])
+                return
+            samples = {
+                name: [seconds * 1000 for seconds in phase_samples]
+                for name, phase_samples in self.__samples.items()
+            }
+            json.dump({"stats": stats, "samples_ms": samples}, fp, indent=2)
+
+
+def _percentile(ordered: list[float], percent: int) -> float:
+    """
+    Get a percentile of sorted samples (nearest rank).
+    """
+    return ordered[min(len(ordered) - 1, len(ordered) * percent // 100)]
+
+
+_UNTIMED = nullcontext()
+
+# The profiler shared by the game loop, screens and sprites.
+profiler = FrameProfiler()
@@ -0,0 +1,57 @@
+import pygame
+
+from .font_registry import font_registry
+from .game_clock import game_clock
+from .profiler import profiler
+
+
+LINE_HEIGHT = 20
+REFRESH_INTERVAL = 500      # Milliseconds between refreshes of the stats shown.
+
+
+class ProfilerOverlay(pygame.sprite.Sprite):
+    """
+    Panel showing the profiler's per-phase frame time percentiles. It is
+    opaque, so it can be drawn over the same spot every frame.
+    """
+
+    def __init__(self, width: int = 520, **kwargs) -> None:
+        pygame.sprite.Sprite.__init__(self)
+
+        # A subclass of Sprite should assign `image` and `rect` attributes.
+        self.image = pygame.Surface((width, LINE_HEIGHT))
+        self.rect = self.image.get_rect(**kwargs)
+
+        self.__kwargs = kwargs
+        self.__font = font_registry.get(size=18)
+        self.__last_refresh = None
+
+    def update(self) -> None:
+        if self.get_time_to_refresh() > 0:
+            return
+        self.__last_refresh = game_clock.get_ticks()
+
+        rows = [("phase (ms)", "p50", "p95", "p99")]
+        for name, stats in sorted(profiler.stats().items()):
+            rows.append(
+                (name, *(f"{stats[key]:.2f}" for key in ("p50_ms", "p95_ms", "p99_ms")))
+            )
+
+        self.image = pygame.Surface((self.rect.width, LINE_HEIGHT * len(rows) + 10))
+        self.image.fill((40, 40, 40))
+        for i, (name, *values) in enumerate(rows):
+            top = 5 + LINE_HEIGHT * i
+            self.image.blit(self.__font.render(name, True, "white"), (8, top))
+            # Right-align the numbers in columns.
+            for j, value in enumerate(values):
+                text = self.__font.render(value, True, "white")
+                self.image.blit(text, text.get_rect(topright=(self.rect.width - 8 - 80*(2-j), top)))
+        self.rect = self.image.get_rect(**self.__kwargs)
+
+    def get_time_to_refresh(self) -> int:
+        """
+        Get the milliseconds until the stats shown are refreshed.
+        """
+        if self.__last_refresh is None:
+            return 0
+        return max(0, self.__last_refresh + REFRESH_INTERVAL - game_clock.get_ticks())
@@ -1,15 +1,20 @@
 import pygame
 from pygame.locals import MOUSEBUTTONUP, QUIT
 
+from .game_clock import game_clock
+from .glyph_cache import glyph_cache
+
 
 class Timer(pygame.sprite.Sprite):
     """
-    Timer that starts counting up upon initialization.
+    Timer that starts counting up upon initialization, from `elapsed_ms` (e.g.
+    to continue a saved game).
     """
 
     def __init__(
         self,
         size: tuple[int, int],
+        elapsed_ms: int = 0,
         **kwargs,
     ) -> None:
         pygame.sprite.Sprite.__init__(self)
@@ -18,32 +23,61 @@ def __init__(
         self.image = pygame.Surface(size)
         self.rect = self.image.get_rect(**kwargs)
 
-        self.font = pygame.font.SysFont("Futura", size=30)
-        self.__start_time = pygame.time.get_ticks()
+        glyph_cache.preload("0123456789:")
+        self.__start_time = game_clock.get_ticks() - elapsed_ms
+
+        # Whether the image changed since the timer was last drawn. It is only
+        # repainted when the shown time changes, once per second.
+        self.dirty = True
+        self.__shown_time = None
 
     def update(self) -> None:
+        elapsed_time = self.get_elapsed_time()
+        if elapsed_time == self.__shown_time:
+            return
+        self.__shown_time = elapsed_time
+        self.dirty = True
+
         self.image.fill("white")
         pygame.draw.rect(self.image, "black",
                          ((0, 0), self.rect.size), width=3)
 
-        text = self.font.render(self.get_elapsed_time(), True, "black")
-        text_rect = text.get_rect(center=self.image.get_rect().center)
-        self.image.blit(text, text_rect)
+        # Lay out the time one cached glyph at a time.
+        glyphs = [glyph_cache.render(char) for char in elapsed_time]
+        width = sum(glyph.get_width() for glyph in glyphs)
+        height = max(glyph.get_height() for glyph in glyphs)
+        left = (self.rect.width - width) // 2
+        top = (self.rect.height - height) // 2
+        for glyph in glyphs:
+            self.image.blit(glyph, (left, top))
+            left += glyph.get_width()
 
     def get_elapsed_time(self) -> str:
         """
         Get the elapsed time in "HH:MM:SS" format.
         """
-        milliseconds = pygame.time.get_ticks() - self.__start_time
+        milliseconds = self.get_elapsed_ms()
         hours, seconds = divmod(milliseconds // 1000, 3600)
         minutes, seconds = divmod(seconds, 60)
         return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
 
+    def get_elapsed_ms(self) -> int:
+        """
+        Get the elapsed time in milliseconds.
+        """
+        return game_clock.get_ticks() - self.__start_time
+
+    def get_time_to_next_second(self) -> int:
+        """
+        Get the milliseconds until the shown time changes.
+        """
+        return 1000 - (game_clock.get_ticks() - self.__start_time) % 1000
+
     def reset(self) -> None:
         """
         Reset the timer.
         """
-        self.__start_time = pygame.time.get_ticks()
+        self.__start_time = game_clock.get_ticks()
 
 
 def main() -> None:
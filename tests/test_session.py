@@ -0,0 +1,85 @@
+import struct
+import unittest
+
+from src.sudoku.action_stack import NEW_SHIFT, NOTES_FLAG, OLD_SHIFT
+from src.sudoku.board import Board
+from src.sudoku.session import CLUES_SIZE, HEADER, NOTES, Session, decode_session, encode_session
+
+
+CELLS_OFFSET = HEADER.size
+CLUES_OFFSET = CELLS_OFFSET + 81
+NOTES_OFFSET = CLUES_OFFSET + CLUES_SIZE
+HISTORY_OFFSET = NOTES_OFFSET + NOTES.size
+
+
+def make_session(history: tuple[int, ...] = (), applied: int = 0) -> bytes:
+    """
+    Pack a session with a clue 5 in the first cell and the given history.
+    """
+    board = Board(bytes([5]) + bytes(80))
+    history_bytes = struct.pack(f"<{len(history)}I", *history)
+    return encode_session(Session(board, (0,) * 81, 1000, history_bytes, applied))
+
+
+def patch(data: bytes, offset: int, value: bytes) -> bytes:
+    """
+    Overwrite the bytes at an offset of a packed session.
+    """
+    return data[:offset] + value + data[offset + len(value):]
+
+
+class DecodeSessionTest(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        data = make_session((1 | 3 << NEW_SHIFT, 2 | NOTES_FLAG | 0x1FF << NEW_SHIFT), 2)
+        self.assertEqual(encode_session(decode_session(data)), data)
+
+    def test_rejects_board_digit_above_9(self) -> None:
+        data = patch(make_session(), CELLS_OFFSET + 1, bytes([10]))
+        with self.assertRaises(ValueError):
+            decode_session(data)
+
+    def test_rejects_clue_beyond_cell_80(self) -> None:
+        clues = (1 | 1 << 81).to_bytes(CLUES_SIZE, "little")
+        data = patch(make_session(), CLUES_OFFSET, clues)
+        with self.assertRaises(ValueError):
+            decode_session(data)
+
+    def test_rejects_clue_on_empty_cell(self) -> None:
+        clues = (1 | 1 << 1).to_bytes(CLUES_SIZE, "little")
+        data = patch(make_session(), CLUES_OFFSET, clues)
+        with self.assertRaises(ValueError):
+            decode_session(data)
+
+    def test_rejects_notes_above_9_bits(self) -> None:
+        data = patch(make_session(), NOTES_OFFSET, struct.pack("<H", 0xFFFF))
+        with self.assertRaises(ValueError):
+            decode_session(data)
+
+    def test_rejects_history_cell_index_above_80(self) -> None:
+        with self.assertRaises(ValueError):
+            decode_session(make_session((81 | 3 << NEW_SHIFT,), 1))
+
+    def test_rejects_history_old_digit_above_9(self) -> None:
+        with self.assertRaises(ValueError):
+            decode_session(make_session((1 | 15 << OLD_SHIFT,), 1))
+
+    def test_rejects_history_new_digit_above_9(self) -> None:
+        with self.assertRaises(ValueError):
+            decode_session(make_session((1 | 15 << NEW_SHIFT,), 1))
+
+    def test_rejects_history_unknown_bits(self) -> None:
+        with self.assertRaises(ValueError):
+            decode_session(make_session((1 | 3 << NEW_SHIFT | 1 << 27,), 1))
+
+    def test_rejects_applied_above_history_size(self) -> None:
+        with self.assertRaises(ValueError):
+            decode_session(make_session((1 | 3 << NEW_SHIFT,), 2))
+
+    def test_rejects_truncated_history(self) -> None:
+        data = make_session((1 | 3 << NEW_SHIFT,), 1)
+        with self.assertRaises(ValueError):
+            decode_session(data[:-1])
+
+
+if __name__ == "__main__":
+    unittest.main()